@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+bench.py — headless benchmarks for wall.py and app.py
+Generates synthetic corpora once (mixed-size wallpapers, .desktop files),
+then times the hot paths under QT_QPA_PLATFORM=offscreen and prints one
+JSON document, so runs from different commits can be diffed.
+Usage: python bench/bench.py [--only a,b] [--out results.json]
+       python bench/bench.py --compare base.json new.json
+
+Every run gets a throwaway HOME, so caches start cold and the real
+~/.cache is never touched; the corpus itself is kept in ~/.cache/hypr-bench.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+CORPUS_ROOT = Path.home() / ".cache/hypr-bench"
+
+# ── Config ────────────────────────────────────────────────────────────────────
+
+IMAGES = 10_000
+APPS = 5_000
+THUMBS = 1_000  # images pushed through the thumbnail loader (cold and warm)
+PER_DIR = 500  # wallpapers per sub-folder, so the index recurses
+
+# (width, height, format, weight) — mostly landscape JPEGs, a few oversized,
+# portrait and lossless ones
+SIZES = [
+    (1920, 1080, "jpg", 6),
+    (2560, 1440, "jpg", 5),
+    (3840, 2160, "jpg", 3),
+    (1080, 1920, "jpg", 1),
+    (5120, 2880, "jpg", 1),
+    (1600, 900, "png", 1),
+    (1920, 1080, "webp", 1),
+]
+
+SCROLL_STEPS = 60  # key presses in the scripted scroll
+SCROLL_REPEAT_MS = 40  # key-repeat interval
+QUERIES = ["fire", "term", "app 12", "zzz", "settings"]
+
+WORDS = (
+    "audio browser calendar chat clock code disk draw editor files fire fox "
+    "games image mail maps music notes office paint photo player printer "
+    "reader screen settings shell sound system term text tools video viewer "
+    "volume weather web"
+).split()
+
+
+# ── Corpus ────────────────────────────────────────────────────────────────────
+
+
+def _make_image(job: tuple[int, str, int, int, str]):
+    from PIL import Image, ImageDraw
+
+    seed, path, w, h, fmt = job
+    rnd = random.Random(seed)
+    # Gradients plus a few shapes: cheap to make, and unlike flat colour they
+    # cost the decoder roughly what a photo does per pixel
+    bands = [
+        Image.linear_gradient("L").rotate(rnd.randrange(360)).resize((w, h))
+        for _ in range(3)
+    ]
+    im = Image.merge("RGB", bands)
+    draw = ImageDraw.Draw(im)
+    for _ in range(6):
+        x, y = rnd.randrange(w), rnd.randrange(h)
+        r = rnd.randrange(h // 8, h // 2)
+        fill = tuple(rnd.randrange(256) for _ in range(3))
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=fill)
+    if fmt == "png":
+        im.save(path, compress_level=1)
+    else:
+        im.save(path, quality=85)
+
+
+def _make_desktop(rnd: random.Random, i: int) -> str:
+    name = f"{rnd.choice(WORDS).title()} {rnd.choice(WORDS).title()} {i:04}"
+    lines = [
+        "[Desktop Entry]",
+        "Type=Application",
+        f"Name={name}",
+        f"Comment={' '.join(rnd.choices(WORDS, k=6))}",
+        f"Exec=/usr/bin/app{i} %U",
+        f"Icon=app-{i % 40}",
+        f"Terminal={'true' if i % 9 == 0 else 'false'}",
+        f"Categories={rnd.choice(WORDS).title()};",
+    ]
+    if i % 20 == 0:
+        lines.append("NoDisplay=true")
+    return "\n".join(lines) + "\n"
+
+
+def corpus(root: Path, images: int, apps: int) -> tuple[Path, Path]:
+    """(wallpaper dir, applications dir), generating whatever is missing."""
+    walls, desk = root / f"walls-{images}", root / f"apps-{apps}"
+    stamp = walls / ".done"
+    if not stamp.exists():
+        shutil.rmtree(walls, ignore_errors=True)
+        weights = [s[3] for s in SIZES]
+        rnd = random.Random(1)
+        jobs = []
+        for i in range(images):
+            w, h, fmt, _ = rnd.choices(SIZES, weights)[0]
+            d = walls / f"set{i // PER_DIR:03}"
+            d.mkdir(parents=True, exist_ok=True)
+            jobs.append((i, str(d / f"wall{i:05}.{fmt}"), w, h, fmt))
+        print(f"bench: generating {images} wallpapers in {walls}", file=sys.stderr)
+        with ProcessPoolExecutor() as pool:
+            for _ in pool.map(_make_image, jobs, chunksize=16):
+                pass
+        stamp.touch()
+    if not (desk / ".done").exists():
+        shutil.rmtree(desk, ignore_errors=True)
+        desk.mkdir(parents=True)
+        rnd = random.Random(2)
+        for i in range(apps):
+            (desk / f"app{i:05}.desktop").write_text(_make_desktop(rnd, i))
+        (desk / ".done").touch()
+    return walls, desk
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+def summary(samples: list[float]) -> dict:
+    """Milliseconds: count, mean and tail percentiles of samples in seconds."""
+    ms = sorted(x * 1000 for x in samples)
+    if not ms:
+        return {"count": 0}
+
+    def pick(q: float) -> float:
+        return round(ms[min(len(ms) - 1, int(q * len(ms)))], 3)
+
+    return {
+        "count": len(ms),
+        "mean": round(sum(ms) / len(ms), 3),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "max": round(ms[-1], 3),
+    }
+
+
+def wait_until(app, done, timeout: float) -> bool:
+    """Run the event loop until done() or timeout seconds pass."""
+    from PyQt6 import QtCore
+
+    end = time.perf_counter() + timeout
+    while not done():
+        if time.perf_counter() > end:
+            return False
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 20)
+        time.sleep(0.001)
+    return True
+
+
+def commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "-C", str(REPO), "describe", "--always", "--dirty"],
+            capture_output=True,
+            text=True,
+        )
+        return out.stdout.strip()
+    except OSError:
+        return ""
+
+
+# ── Benchmarks ────────────────────────────────────────────────────────────────
+# Each takes the run context and returns a JSON-able dict.
+
+
+def bench_index(ctx) -> dict:
+    """WallIndex.refresh() over the whole corpus, without and with a manifest."""
+    wall = ctx.wall
+    manifest = ctx.home / "bench-index.json"  # main() already saved index.json
+    out = {}
+    for phase in ("cold", "warm"):
+        idx = wall.WallIndex(ctx.walls, manifest)
+        start = time.perf_counter()
+        idx.refresh()
+        out[f"{phase}_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        out["files"] = len(idx.images)
+        idx._save()
+    return out
+
+
+def bench_crop(ctx) -> dict:
+    """One card thumbnail (decode + cover crop) in this thread, by source kind."""
+    from PyQt6 import QtGui
+
+    wall = ctx.wall
+    by_kind: dict[str, list[Path]] = {}
+    for p in ctx.images:
+        size = QtGui.QImageReader(str(p)).size()
+        kind = f"{size.width()}x{size.height()}{p.suffix}"
+        if len(by_kind.setdefault(kind, [])) < 12:
+            by_kind[kind].append(p)
+    out = {}
+    for kind, paths in sorted(by_kind.items()):
+        times = []
+        for p in paths:
+            start = time.perf_counter()
+            wall.crop_image(p, wall.THUMB_W, wall.THUMB_H)
+            times.append(time.perf_counter() - start)
+        out[kind] = summary(times)
+    return out
+
+
+def bench_thumbs(ctx) -> dict:
+    """ThumbLoader throughput: decodes into an empty pack, then pack hits."""
+    wall = ctx.wall
+    images = ctx.images[: ctx.args.thumbs]
+    out = {"images": len(images), "workers": wall.DECODE_WORKERS}
+    for phase in ("cold", "warm"):
+        got = set()
+        loader = wall.ThumbLoader(images)
+        loader.loaded.connect(lambda path, _img: got.add(path))
+        start = time.perf_counter()
+        loader.start()
+        finished = wait_until(ctx.app, lambda: len(got) >= len(images), 600)
+        elapsed = time.perf_counter() - start
+        loader.stop()
+        out[phase] = {
+            "seconds": round(elapsed, 3),
+            "per_second": round(len(got) / elapsed, 1),
+            "complete": finished,
+        }
+    return out
+
+
+def _scroll(ctx, renderer: str) -> dict:
+    from PyQt6 import QtCore
+
+    wall = ctx.wall
+    wall.PROFILE, wall.RENDERER = "1", renderer
+    images = ctx.images[: ctx.args.thumbs]
+    c = wall.Carousel(list(images))
+    c.show()
+    if renderer and c._quick is None:
+        c._stats = None
+        c.close()
+        return {"skipped": "renderer unavailable"}
+    # Let the neighbourhood load so frames measure drawing, not decoding
+    wait_until(ctx.app, lambda: len(c.thumbs) >= min(len(images), 40), 60)
+    stats = c._stats = wall.FrameStats(1.0 / c._stats.period)
+    steps = [0]
+
+    def step():
+        c.go_right()
+        steps[0] += 1
+        if steps[0] == SCROLL_STEPS:
+            timer.stop()
+
+    timer = QtCore.QTimer()
+    timer.timeout.connect(step)
+    start = time.perf_counter()
+    timer.start(SCROLL_REPEAT_MS)
+    wait_until(ctx.app, lambda: steps[0] == SCROLL_STEPS and not c._animating, 60)
+    elapsed = time.perf_counter() - start
+    c._stats = None
+    c.close()
+    result = stats.summary()
+    # The offscreen platform has no vsync, so this is how fast frames can be
+    # produced rather than a rate capped at the refresh
+    result["fps"] = round(len(stats.paint) / elapsed, 1)
+    result["seconds"] = round(elapsed, 3)
+    return result
+
+
+def bench_scroll(ctx) -> dict:
+    """Frames during a key-repeat scroll through warm thumbnails (QPainter)."""
+    return _scroll(ctx, "")
+
+
+def bench_scroll_quick(ctx) -> dict:
+    """The same scroll through the Qt Quick renderer."""
+    return _scroll(ctx, "quick")
+
+
+def bench_launcher(ctx) -> dict:
+    """Launcher start-up over the .desktop corpus, cold and with a warm parse cache."""
+    app = ctx.launcher
+    out = {"apps": ctx.args.apps}
+    start = time.perf_counter()
+    w = app.Launcher(resident=True)
+    built = time.perf_counter()
+    w.show()
+    ctx.app.processEvents()
+    w.repaint()
+    shown = time.perf_counter()
+    out["construct_ms"] = round((built - start) * 1000, 2)
+    out["first_paint_ms"] = round((shown - start) * 1000, 2)
+    out["listed"] = len(w.all_apps)
+    start = time.perf_counter()
+    app.scan_apps(w._desktop_cache)
+    out["rescan_warm_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    ctx.launcher_window = w
+    return out
+
+
+def bench_keystroke(ctx) -> dict:
+    """Key press in the search box to the repainted result list."""
+    from PyQt6 import QtCore, QtGui
+
+    if getattr(ctx, "launcher_window", None) is None:
+        bench_launcher(ctx)
+    w = ctx.launcher_window
+    search = w._search
+
+    def key(k, text: str = ""):
+        mods = QtCore.Qt.KeyboardModifier.NoModifier
+        start = time.perf_counter()
+        for kind in (QtCore.QEvent.Type.KeyPress, QtCore.QEvent.Type.KeyRelease):
+            ctx.app.sendEvent(search, QtGui.QKeyEvent(kind, k, mods, text))
+        ctx.app.processEvents()
+        w.repaint()
+        return time.perf_counter() - start
+
+    typed, cleared = [], []
+    for q in QUERIES:
+        for ch in q:
+            k = QtCore.Qt.Key.Key_Space if ch == " " else ord(ch.upper())
+            typed.append(key(k, ch))
+        for _ in q:
+            cleared.append(key(QtCore.Qt.Key.Key_Backspace))
+    return {"typed_ms": summary(typed), "backspace_ms": summary(cleared)}
+
+
+BENCHES = {
+    "index": bench_index,
+    "crop": bench_crop,
+    "thumbs": bench_thumbs,
+    "scroll": bench_scroll,
+    "scroll_quick": bench_scroll_quick,
+    "launcher": bench_launcher,
+    "keystroke": bench_keystroke,
+}
+
+
+# ── Compare ───────────────────────────────────────────────────────────────────
+
+
+def _leaves(d: dict, prefix: str = ""):
+    for k, v in d.items():
+        if isinstance(v, dict):
+            yield from _leaves(v, f"{prefix}{k}.")
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            yield prefix + k, v
+
+
+def compare(base: Path, new: Path):
+    """Print every numeric result side by side with its ratio."""
+    a = dict(_leaves(json.loads(base.read_text())["results"]))
+    b = dict(_leaves(json.loads(new.read_text())["results"]))
+    width = max(map(len, a.keys() | b.keys()), default=0)
+    for key in sorted(a.keys() & b.keys()):
+        ratio = f"{b[key] / a[key]:.2f}x" if a[key] else "-"
+        print(f"{key:<{width}}  {a[key]:>12}  {b[key]:>12}  {ratio:>7}")
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+
+class Context:
+    pass
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless wall.py / app.py benchmarks")
+    ap.add_argument("--only", help="comma-separated subset of: " + ", ".join(BENCHES))
+    ap.add_argument("--images", type=int, default=IMAGES)
+    ap.add_argument("--apps", type=int, default=APPS)
+    ap.add_argument("--thumbs", type=int, default=THUMBS)
+    ap.add_argument("--corpus", type=Path, default=CORPUS_ROOT)
+    ap.add_argument("--out", type=Path, help="write JSON here instead of stdout")
+    ap.add_argument("--compare", nargs=2, type=Path, metavar=("BASE", "NEW"))
+    args = ap.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    names = args.only.split(",") if args.only else list(BENCHES)
+    unknown = set(names) - BENCHES.keys()
+    if unknown:
+        sys.exit(f"bench.py: unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    walls, apps_dir = corpus(args.corpus, args.images, args.apps)
+
+    # Everything below reads paths from the environment at import time
+    home = Path(tempfile.mkdtemp(prefix="hypr-bench-"))
+    os.environ.update(
+        HOME=str(home),
+        XDG_CACHE_HOME=str(home / ".cache"),
+        XDG_RUNTIME_DIR=str(home),
+        QT_QPA_PLATFORM="offscreen",
+    )
+    sys.path.insert(0, str(REPO / "scripts"))
+    sys.argv = [sys.argv[0]]
+    from PyQt6 import QtCore, QtWidgets
+
+    import app as launcher
+    import wall
+
+    launcher.APP_DIRS = [apps_dir]
+
+    ctx = Context()
+    ctx.args, ctx.home, ctx.walls = args, home, walls
+    ctx.wall, ctx.launcher, ctx.launcher_window = wall, launcher, None
+    ctx.app = QtWidgets.QApplication(sys.argv)
+    index = wall.WallIndex(walls, home / "index.json")
+    index.refresh()
+    ctx.images = list(index.images)
+
+    results = {}
+    try:
+        for name in names:
+            print(f"bench: {name}", file=sys.stderr)
+            results[name] = BENCHES[name](ctx)
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+    doc = {
+        "meta": {
+            "commit": commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "qt": QtCore.qVersion(),
+            "cpus": os.cpu_count(),
+            "images": len(ctx.images),
+            "apps": args.apps,
+        },
+        "results": results,
+    }
+    text = json.dumps(doc, indent=2)
+    if args.out:
+        args.out.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
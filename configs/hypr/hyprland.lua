@@ -38,6 +38,8 @@ hl.on("hyprland.start", function()
     hl.exec_cmd("waybar")
     hl.exec_cmd("mako")
     hl.exec_cmd("udiskie")
+    hl.exec_cmd("python3 ~/.config/scripts/wall.py --daemon")
+    hl.exec_cmd("python3 ~/.config/scripts/app.py --daemon")
 end)
 
 --------------------------------------------------------------------------------
@@ -190,7 +190,7 @@ DEV_PACKAGES=(git base-devel wget curl nano jq)
 FONT_PACKAGES=(ttf-jetbrains-mono-nerd ttf-hack-nerd ttf-iosevka-nerd ttf-cascadia-code-nerd)
 MEDIA_PACKAGES=(poppler imagemagick ffmpeg chafa)
 COMPRESSION_PACKAGES=(unzip p7zip tar gzip xz bzip2 unrar trash-cli)
-PYTHON_PACKAGES=(python-pyqt5 python-pyqt6 python-pillow python-opencv)
+PYTHON_PACKAGES=(python-pyqt5 python-pyqt6 python-pillow python-numpy python-opencv)
 QT_PACKAGES=(qt5-wayland qt6-wayland)
 
 ALL_PACKAGES=(
@@ -1,13 +1,51 @@
 #!/usr/bin/env python3
+"""
+app.py — launcher
+Usage: python app.py [--daemon]
+
+With --daemon the launcher stays resident and hidden; later plain
+invocations just toggle it over a Unix socket instead of starting up.
+"""
 import configparser
 import json
+import math
 import os
 import re
+import socket
 import subprocess
 import sys
 from pathlib import Path
 
-from PyQt6 import QtCore, QtGui, QtWidgets
+import tracing
+
+# Startup phases, written as a Chrome trace when APP_TRACE is set
+TRACE = tracing.Tracer("app", "APP_TRACE")
+
+# ── Daemon client ─────────────────────────────────────────────────────────────
+SOCKET = Path(os.environ.get("XDG_RUNTIME_DIR") or "/tmp") / "launcher.sock"
+
+
+def daemon_request(line: str) -> str | None:
+    """Send one command line to a running daemon; its reply, or None if absent."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(2.0)
+            s.connect(str(SOCKET))
+            s.sendall(line.encode() + b"\n")
+            return s.makefile().readline().strip()
+    except OSError:
+        return None
+
+
+# Hand off to a resident launcher before paying for the PyQt imports
+if __name__ == "__main__" and "--daemon" not in sys.argv[1:]:
+    with TRACE.phase("daemon handoff"):
+        _handed_off = daemon_request("toggle") == "ok"
+    if _handed_off:
+        sys.exit(0)
+
+with TRACE.phase("import PyQt6"):
+    from PyQt6 import QtCore, QtGui, QtNetwork, QtWidgets
 
 # ── Config ────────────────────────────────────────────────────────────────────
 APP_DIRS = [Path.home() / ".local/share/applications", Path("/usr/share/applications")]
@@ -22,6 +60,9 @@ WIN_H = 480
 # "left", "center", or "right"
 WALL_ALIGN = "left"
 
+# Largest decode buffer allowed for the wallpaper panel (MB)
+DECODE_LIMIT_MB = 192
+
 EXCLUDE = [
     "ssh", "server", "avahi", "helper", "setup", "settings daemon",
     "gnome-session", "xfce", "lstopo", "qt", "xgps",
@@ -51,6 +92,7 @@ _FIELD_RE = re.compile(r"%[fFuUckidDnNvm]")
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
+@TRACE.timed
 def load_pywal():
     fallback = ("#1a1a1a", "#c0caf5", "#7aa2f7", "#bb9af7")
     if not WAL_CACHE.exists():
@@ -77,21 +119,45 @@ def mk_alpha(hex_c: str, a: int) -> str:
     return c.name(QtGui.QColor.NameFormat.HexArgb)
 
 
+@TRACE.timed
 def load_wall(path, w, h, align="center"):
     if not path or not os.path.exists(path):
         return QtGui.QPixmap()
-    src = QtGui.QPixmap(path)
+    screen = QtGui.QGuiApplication.primaryScreen()
+    dpr = screen.devicePixelRatio() if screen else 1.0
+    w, h = round(w * dpr), round(h * dpr)
+
+    # Decode straight at panel size — JPEG scales inside the DCT, so the
+    # full-resolution wallpaper is never allocated
+    reader = QtGui.QImageReader(path)
+    reader.setAutoTransform(True)
+    reader.setAllocationLimit(DECODE_LIMIT_MB)
+    size = reader.size()
+    if size.isValid():
+        if reader.transformation() & QtGui.QImageIOHandler.Transformation.TransformationRotate90:
+            size.transpose()
+        scale = max(w / size.width(), h / size.height())
+        if scale < 1.0:
+            size = QtCore.QSize(math.ceil(size.width() * scale), math.ceil(size.height() * scale))
+            if reader.transformation() & QtGui.QImageIOHandler.Transformation.TransformationRotate90:
+                size.transpose()
+            reader.setScaledSize(size)
+    src = reader.read()
     if src.isNull():
         return QtGui.QPixmap()
+
     scaled = src.scaledToHeight(h, QtCore.Qt.TransformationMode.SmoothTransformation)
     if scaled.width() < w:
         scaled = src.scaledToWidth(w, QtCore.Qt.TransformationMode.SmoothTransformation)
     if align == "left":
-        return scaled.copy(0, 0, w, h)
+        scaled = scaled.copy(0, 0, w, h)
     elif align == "right":
-        return scaled.copy(scaled.width() - w, 0, w, h)
+        scaled = scaled.copy(scaled.width() - w, 0, w, h)
     else:
-        return scaled.copy((scaled.width() - w) // 2, 0, w, h)
+        scaled = scaled.copy((scaled.width() - w) // 2, 0, w, h)
+    px = QtGui.QPixmap.fromImage(scaled)
+    px.setDevicePixelRatio(dpr)
+    return px
 
 
 def clean_exec(raw: str) -> str:
@@ -103,6 +169,66 @@ def truncate(text: str, max_chars: int) -> str:
     return text if len(text) <= max_chars else text[: max_chars - 1] + "…"
 
 
+def parse_desktop(path: Path) -> dict | None:
+    """The launcher entry for one .desktop file, or None if it should not be listed."""
+    cfg = configparser.ConfigParser(interpolation=None)
+    try:
+        cfg.read(path, encoding="utf-8")
+        if "Desktop Entry" not in cfg:
+            return None
+        e = cfg["Desktop Entry"]
+        if e.get("NoDisplay", "").lower() == "true":
+            return None
+        if e.get("Hidden", "").lower() == "true":
+            return None
+        name = e.get("Name", "").strip()
+        if not name:
+            return None
+        if any(k in name.lower() for k in EXCLUDE):
+            return None
+        raw_exec = e.get("Exec", "")
+        if not raw_exec:
+            return None
+        return {
+            "Name":     name,
+            "Exec":     raw_exec,
+            "Icon":     e.get("Icon", ""),
+            "Terminal": e.get("Terminal", "false").lower() == "true",
+        }
+    except Exception:
+        return None
+
+
+@TRACE.timed
+def scan_apps(cache: dict[Path, tuple[float, dict | None]]) -> list[dict]:
+    """All listed apps, first directory wins on duplicate names.
+
+    cache maps each .desktop file to (mtime, entry); only files whose mtime
+    changed are parsed again, and vanished files are dropped from it.
+    """
+    apps, seen, alive = [], set(), set()
+    for d in APP_DIRS:
+        if not d.exists():
+            continue
+        for f in sorted(d.glob("*.desktop")):
+            try:
+                mtime = f.stat().st_mtime
+            except OSError:
+                continue
+            alive.add(f)
+            hit = cache.get(f)
+            if hit is None or hit[0] != mtime:
+                hit = cache[f] = (mtime, parse_desktop(f))
+            app = hit[1]
+            if app is None or app["Name"] in seen:
+                continue
+            apps.append(app)
+            seen.add(app["Name"])
+    for f in cache.keys() - alive:
+        del cache[f]
+    return apps
+
+
 # ── Cached fonts ──────────────────────────────────────────────────────────────
 
 _FONT_CACHE: dict[tuple, QtGui.QFont] = {}
@@ -118,6 +244,56 @@ def get_font(size: int, bold: bool = False) -> QtGui.QFont:
     return _FONT_CACHE[key]
 
 
+# ── Cached icons ──────────────────────────────────────────────────────────────
+
+# Keyed on (icon theme, name); names the theme lacked get the default icon,
+# and are remembered so an install that adds them can be picked up
+_ICON_CACHE: dict[tuple[str, str], QtGui.QPixmap] = {}
+_ICON_MISSING: set[tuple[str, str]] = set()
+
+
+@TRACE.timed
+def get_icon(name: str) -> QtGui.QPixmap:
+    key = (QtGui.QIcon.themeName(), name)
+    if key not in _ICON_CACHE:
+        icon = QtGui.QIcon.fromTheme(name)
+        if icon.isNull():
+            _ICON_MISSING.add(key)
+            icon = QtGui.QIcon.fromTheme("application-default-icon")
+        _ICON_CACHE[key] = icon.pixmap(QtCore.QSize(22, 22))
+    return _ICON_CACHE[key]
+
+
+def forget_icons(missing_only: bool = False) -> set[str]:
+    """Drop cached icons, or just the stand-ins; returns the names dropped."""
+    keys = set(_ICON_MISSING) if missing_only else set(_ICON_CACHE)
+    for key in keys:
+        _ICON_CACHE.pop(key, None)
+    _ICON_MISSING.difference_update(keys)
+    if keys:
+        # Qt keeps its own lookups, misses included, until the path is set again
+        QtGui.QIcon.setThemeSearchPaths(QtGui.QIcon.themeSearchPaths())
+    return {name for _, name in keys}
+
+
+# ── App scanner ───────────────────────────────────────────────────────────────
+
+class AppScanner(QtCore.QThread):
+    """Re-lists the application dirs off the GUI thread, emitting the app list.
+
+    Shares the launcher's parse cache, so only changed .desktop files are read.
+    """
+
+    found = QtCore.pyqtSignal(list)
+
+    def __init__(self, cache: dict):
+        super().__init__()
+        self._cache = cache
+
+    def run(self):
+        self.found.emit(scan_apps(self._cache))
+
+
 # ── App Row ───────────────────────────────────────────────────────────────────
 
 class AppRow(QtWidgets.QWidget):
@@ -140,15 +316,17 @@ class AppRow(QtWidgets.QWidget):
             self._icon = None
         else:
             self._glyph = None
-            icon = QtGui.QIcon.fromTheme(app.get("Icon", ""))
-            if icon.isNull():
-                icon = QtGui.QIcon.fromTheme("application-default-icon")
-            self._icon = icon.pixmap(QtCore.QSize(22, 22))
+            self._icon = get_icon(app.get("Icon", ""))
 
         # Pre-build display strings once
         self._name = app.get("Name", "")
         self._exec_display = truncate(clean_exec(app.get("Exec", "")), 38)
 
+    def refresh_icon(self):
+        if self._glyph is None:
+            self._icon = get_icon(self._app.get("Icon", ""))
+            self.update()
+
     def set_selected(self, val: bool):
         if self._selected != val:
             self._selected = val
@@ -205,14 +383,20 @@ class AppRow(QtWidgets.QWidget):
 # ── Main Launcher ─────────────────────────────────────────────────────────────
 
 class Launcher(QtWidgets.QWidget):
-    def __init__(self):
+    @TRACE.timed
+    def __init__(self, resident: bool = False):
         super().__init__()
+        # A resident launcher hides instead of quitting and waits to be summoned
+        self.resident = resident
         self.setFixedSize(WIN_W, WIN_H)
         self.setWindowFlags(QtCore.Qt.WindowType.FramelessWindowHint)
         self.setAttribute(QtCore.Qt.WidgetAttribute.WA_TranslucentBackground)
 
         self._selected_idx = -1   # keyboard selection index into self._rows
         self._rows: list[AppRow] = []
+        self._row_cache: dict[str, AppRow] = {}   # by app name, reused across searches
+        self._icon_theme = QtGui.QIcon.themeName()   # the one the rows' icons came from
+        self._desktop_cache: dict[Path, tuple[float, dict | None]] = {}
 
         # Watch pywal files for live theme updates
         self.watcher = QtCore.QFileSystemWatcher(self)
@@ -288,25 +472,44 @@ class Launcher(QtWidgets.QWidget):
         self._refresh_theme()
         self._find_apps()
 
-        timer = QtCore.QTimer(self)
-        timer.timeout.connect(self._tick)
-        timer.start(1000)
+        # Later rescans run in the background whenever an app dir changes;
+        # installs touch many files at once, so wait for them to settle
+        self._scanner = AppScanner(self._desktop_cache)
+        self._scanner.found.connect(self._on_apps_found)
+        self._scanner.finished.connect(self._on_scan_finished)
+        self._rescan_again = False
+        self._scan_timer = QtCore.QTimer(self)
+        self._scan_timer.setSingleShot(True)
+        self._scan_timer.setInterval(300)
+        self._scan_timer.timeout.connect(self._rescan)
+        self.app_watcher = QtCore.QFileSystemWatcher(self)
+        for d in APP_DIRS:
+            if d.exists():
+                self.app_watcher.addPath(str(d))
+        self.app_watcher.directoryChanged.connect(self._scan_timer.start)
+
+        self._clock_timer = QtCore.QTimer(self)
+        self._clock_timer.timeout.connect(self._tick)
+        self._clock_timer.start(1000)
         self._tick()
         self._center()
         self._search.setFocus()
-        self.show()
+        if not resident:
+            self.show()
 
     # ── Theme ────────────────────────────────────────────────────────────────
 
+    @TRACE.timed
     def _refresh_theme(self):
         self.BG, self.FG, self.ACC, self.ACC2 = load_pywal()
         px = load_wall(wal_path(), WALL_W, WIN_H, align=WALL_ALIGN)
         if not px.isNull():
             self.left_img.setPixmap(px)
-        for row in self._rows:
+        for row in self._row_cache.values():
             row.update_colors(self.ACC, self.FG)
         self._apply_style()
 
+    @TRACE.timed
     def _apply_style(self):
         self.setStyleSheet(f"""
             #MainFrame {{
@@ -372,6 +575,7 @@ class Launcher(QtWidgets.QWidget):
 
     # ── Apps ─────────────────────────────────────────────────────────────────
 
+    @TRACE.timed
     def _load_usage(self) -> dict:
         try:
             return json.loads(USAGE_FILE.read_text()) if USAGE_FILE.exists() else {}
@@ -384,48 +588,59 @@ class Launcher(QtWidgets.QWidget):
         except Exception:
             pass
 
+    @TRACE.timed
     def _find_apps(self):
-        apps, seen = [], set()
-        for d in APP_DIRS:
-            if not d.exists():
-                continue
-            for f in sorted(d.glob("*.desktop")):
-                cfg = configparser.ConfigParser(interpolation=None)
-                try:
-                    cfg.read(f, encoding="utf-8")
-                    if "Desktop Entry" not in cfg:
-                        continue
-                    e = cfg["Desktop Entry"]
-                    if e.get("NoDisplay", "").lower() == "true":
-                        continue
-                    if e.get("Hidden", "").lower() == "true":
-                        continue
-                    name = e.get("Name", "").strip()
-                    if not name or name in seen:
-                        continue
-                    if any(k in name.lower() for k in EXCLUDE):
-                        continue
-                    raw_exec = e.get("Exec", "")
-                    if not raw_exec:
-                        continue
-                    apps.append({
-                        "Name":     name,
-                        "Exec":     raw_exec,
-                        "Icon":     e.get("Icon", ""),
-                        "Terminal": e.get("Terminal", "false").lower() == "true",
-                    })
-                    seen.add(name)
-                except Exception:
-                    continue
+        self.all_apps = scan_apps(self._desktop_cache)
+        self._rebuild(self.all_apps)
+
+    def _rescan(self):
+        if self._scanner.isRunning():
+            self._rescan_again = True
+        else:
+            self._scanner.start()
+
+    def _on_scan_finished(self):
+        if self._rescan_again:
+            self._rescan_again = False
+            self._scanner.start()
+
+    def _on_apps_found(self, apps: list[dict]):
+        if apps == self.all_apps:
+            return
         self.all_apps = apps
-        self._rebuild(apps)
+        for name in self._row_cache.keys() - {a["Name"] for a in apps}:
+            self._row_cache.pop(name).deleteLater()
+        # An install may have brought icons the theme lacked; look those up again
+        self._refresh_icons(forget_icons(missing_only=True))
+        text = self._search.text()
+        if text:
+            self._on_search_changed(text)
+        else:
+            self._rebuild(apps)
 
+    def _refresh_icons(self, names: set[str] | None = None):
+        """Look the kept rows' icons up again: those named, or all of them."""
+        if names is not None and not names:
+            return
+        for row in self._row_cache.values():
+            if names is None or row._app.get("Icon", "") in names:
+                row.refresh_icon()
+
+    def _check_icon_theme(self):
+        theme = QtGui.QIcon.themeName()
+        if theme != self._icon_theme:
+            self._icon_theme = theme
+            forget_icons()
+            self._refresh_icons()
+
+    @TRACE.timed
     def _rebuild(self, apps: list[dict]):
-        # Clear existing rows
+        # Take rows out of the layout; they are kept for reuse, just hidden
         while self.list_layout.count():
-            item = self.list_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+            self.list_layout.takeAt(0)
+        for row in self._rows:
+            row.set_selected(False)
+            row.hide()
 
         self._rows = []
         self._selected_idx = -1
@@ -435,9 +650,15 @@ class Launcher(QtWidgets.QWidget):
             key=lambda a: (-self.usage.get(a["Name"], 0), a["Name"].lower()),
         )
         for app in srt:
-            row = AppRow(app, self.ACC, self.FG)
-            row.launched.connect(self._execute)
+            row = self._row_cache.get(app["Name"])
+            if row is None or row._app != app:
+                if row is not None:
+                    row.deleteLater()
+                row = AppRow(app, self.ACC, self.FG)
+                row.launched.connect(self._execute)
+                self._row_cache[app["Name"]] = row
             self.list_layout.addWidget(row)
+            row.show()
             self._rows.append(row)
 
         # Trailing spacer so items stack from top
@@ -484,14 +705,14 @@ class Launcher(QtWidgets.QWidget):
                     self._execute(self._rows[0]._app)
                 return True
             if key == QtCore.Qt.Key.Key_Escape:
-                QtWidgets.QApplication.quit()
+                self._dismiss()
                 return True
         return super().eventFilter(obj, event)
 
     def keyPressEvent(self, event):
         key = event.key()
         if key == QtCore.Qt.Key.Key_Escape:
-            QtWidgets.QApplication.quit()
+            self._dismiss()
         else:
             super().keyPressEvent(event)
 
@@ -504,11 +725,44 @@ class Launcher(QtWidgets.QWidget):
         if app.get("Terminal"):
             cmd = f"{TERMINAL} -- {cmd}"
         subprocess.Popen(cmd, shell=True, start_new_session=True)
-        QtWidgets.QApplication.quit()
+        self._dismiss()
 
     def _run_cmd(self, cmd: str):
         subprocess.Popen(cmd, shell=True, start_new_session=True)
-        QtWidgets.QApplication.quit()
+        self._dismiss()
+
+    # ── Resident mode ────────────────────────────────────────────────────────
+
+    def _dismiss(self):
+        if self.resident:
+            self.hide()
+            self._clock_timer.stop()
+        else:
+            QtWidgets.QApplication.quit()
+
+    def summon(self):
+        """Show the resident launcher again with an empty search and focus in it."""
+        # Theme files replaced while hidden can drop off the watcher
+        missed = False
+        for f in [WAL_CACHE, WAL_WALL]:
+            if f.exists() and str(f) not in self.watcher.files():
+                self.watcher.addPath(str(f))
+                missed = True
+        if missed:
+            self._refresh_theme()
+        self._check_icon_theme()
+        self._search.blockSignals(True)
+        self._search.clear()
+        self._search.blockSignals(False)
+        self._rebuild(self.all_apps)
+        self.scroll.verticalScrollBar().setValue(0)
+        self._tick()
+        self._clock_timer.start(1000)
+        self._center()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self._search.setFocus()
 
     # ── Clock ────────────────────────────────────────────────────────────────
 
@@ -524,7 +778,56 @@ class Launcher(QtWidgets.QWidget):
         self.move(screen.center() - self.rect().center())
 
 
+# ── Daemon ────────────────────────────────────────────────────────────────────
+
+class LauncherDaemon(QtCore.QObject):
+    """Keeps one Launcher resident and toggles it for clients on SOCKET."""
+
+    def __init__(self):
+        super().__init__()
+        self.launcher = Launcher(resident=True)
+        self._server = QtNetwork.QLocalServer(self)
+        self._server.setSocketOptions(QtNetwork.QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_connection)
+
+    def listen(self) -> bool:
+        QtNetwork.QLocalServer.removeServer(str(SOCKET))
+        return self._server.listen(str(SOCKET))
+
+    def toggle(self):
+        if self.launcher.isVisible():
+            self.launcher._dismiss()
+        else:
+            self.launcher.summon()
+
+    def _on_connection(self):
+        while self._server.hasPendingConnections():
+            conn = self._server.nextPendingConnection()
+            conn.readyRead.connect(lambda c=conn: self._on_ready(c))
+            conn.disconnected.connect(conn.deleteLater)
+
+    def _on_ready(self, conn: QtNetwork.QLocalSocket):
+        if not conn.canReadLine():
+            return
+        if bytes(conn.readLine()).decode().strip() == "toggle":
+            self.toggle()
+        conn.write(b"ok\n")
+        conn.flush()
+        conn.disconnectFromServer()
+
+
 if __name__ == "__main__":
-    app = QtWidgets.QApplication(sys.argv)
+    with TRACE.phase("QApplication"):
+        app = QtWidgets.QApplication(sys.argv)
+    if "--daemon" in sys.argv[1:]:
+        if daemon_request("ping") is not None:
+            sys.exit(0)   # already running
+        app.setQuitOnLastWindowClosed(False)
+        daemon = LauncherDaemon()
+        TRACE.until_frame(daemon.launcher)   # the first summon
+        if not daemon.listen():
+            sys.exit(f"app.py: cannot listen on {SOCKET}")
+        sys.exit(app.exec())
     w = Launcher()
+    TRACE.until_frame(w)
     sys.exit(app.exec())
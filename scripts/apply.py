@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+apply.py — theme switch pipeline
+Runs the steps of applying a wallpaper as a dependency graph: each step
+starts as soon as the ones it needs have finished, and restarted daemons are
+waited on rather than slept for. Per-step timings go to ~/.cache/wall/apply.log.
+Usage: python apply.py [-v] <image>
+"""
+
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+# ── Config ────────────────────────────────────────────────────────────────────
+
+SCRIPTS = Path(__file__).resolve().parent
+WAL_CACHE = Path.home() / ".cache/wal/colors.json"
+CURRENT = Path.home() / ".cache/current-wallpaper"
+RECOLOR = SCRIPTS / "recolor_folders.py"
+RECOLOR_SH = SCRIPTS / "recolor_folders.sh"  # sed fallback
+APPLY_LOG = Path.home() / ".cache/wall/apply.log"
+LOG_LIMIT = 256 << 10  # bytes; the older half is dropped past this
+
+EXIT_TIMEOUT = 1.0  # s to wait for a daemon to exit before SIGKILL
+READY_TIMEOUT = 2.0  # s to wait for a restarted daemon to answer
+POLL = 0.01  # s between readiness checks
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+def wait_for(check: Callable[[], bool], timeout: float) -> bool:
+    end = time.monotonic() + timeout
+    while not check():
+        if time.monotonic() > end:
+            return False
+        time.sleep(POLL)
+    return True
+
+
+def run(*cmd: str) -> str | None:
+    """Run cmd to completion; "missing" if it isn't installed."""
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        return "missing"
+    if proc.returncode:
+        raise RuntimeError(f"{cmd[0]} exited with {proc.returncode}")
+    return None
+
+
+def succeeds(*cmd: str) -> bool:
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        return False
+    return proc.returncode == 0
+
+
+def spawn(*cmd: str):
+    subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def alive(pid: int) -> bool:
+    # Zombies count as gone: they have exited, just not been reaped
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            state = f.read().rpartition(")")[2].split()[0]
+    except (OSError, IndexError):
+        return False
+    return state not in ("Z", "X")
+
+
+def pids(name: str) -> list[int]:
+    """Live processes whose command name is name (as killall matches it)."""
+    found = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit() or int(entry.name) == os.getpid():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/comm") as f:
+                comm = f.read().rstrip("\n")
+        except OSError:
+            continue
+        if comm == name[:15] and alive(int(entry.name)):
+            found.append(int(entry.name))
+    return found
+
+
+def stop(name: str):
+    """SIGTERM every name process and wait until they are gone."""
+    running = pids(name)
+    for pid in running:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+    if not wait_for(lambda: not any(map(alive, running)), EXIT_TIMEOUT):
+        for pid in running:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+
+def restart(name: str, *cmd: str) -> str | None:
+    stop(name)
+    try:
+        spawn(*(cmd or (name,)))
+    except FileNotFoundError:
+        return "missing"
+    return None
+
+
+# ── Steps ─────────────────────────────────────────────────────────────────────
+
+
+class Step(NamedTuple):
+    name: str
+    needs: tuple[str, ...]
+    run: Callable[[dict], str | None]  # returns a status note, raises on failure
+
+
+def step_wallpaper(state: dict) -> str | None:
+    # wall.py may pass {output: file} of copies already at each output's size
+    try:
+        variants = json.loads(os.environ.get("WALL_VARIANTS", "{}"))
+    except ValueError:
+        variants = {}
+    if not variants or not all(map(os.path.exists, variants.values())):
+        return run("awww", "img", state["path"], "--transition-type", "simple")
+    with ThreadPoolExecutor(len(variants)) as pool:
+        jobs = [
+            pool.submit(run, "awww", "img", "-o", out, f, "--transition-type", "simple")
+            for out, f in variants.items()
+        ]
+        statuses = [j.result() for j in jobs]
+    return statuses[0] if any(statuses) else "variants"
+
+
+def step_palette(state: dict) -> str | None:
+    if os.environ.get("PALETTE_READY") == "1":
+        return "cached"  # wall.py already wrote colors.json
+    try:
+        import palette
+
+        palette.apply(Path(state["path"]))
+        return None
+    except (ImportError, OSError, ValueError):
+        pass
+    # No NumPy/Pillow, or an image they can't read: pywal does it all
+    state["templated"] = True
+    run("wal", "-i", state["path"], "--backend", "haiku")
+    return "fallback"
+
+
+def step_templates(state: dict) -> str | None:
+    if state.get("templated"):
+        return "skipped"
+    try:
+        import pywal
+    except ImportError:
+        # pywal only as a command: it re-renders every template itself
+        return run("wal", "--theme", str(WAL_CACHE), "-n", "-q")
+    import templates
+
+    # What `wal --theme -n` does, except that templates.py renders the files
+    # and leaves the unchanged ones alone
+    scheme = pywal.theme.file(str(WAL_CACHE))
+    pywal.sequences.send(scheme)
+    changed = templates.Renderer().render_all(scheme)
+    pywal.reload.env()
+    return f"{len(changed)} changed"
+
+
+def step_link(state: dict) -> str | None:
+    tmp = CURRENT.with_name(CURRENT.name + ".tmp")
+    CURRENT.parent.mkdir(parents=True, exist_ok=True)
+    tmp.unlink(missing_ok=True)
+    tmp.symlink_to(state["path"])
+    os.replace(tmp, CURRENT)
+    return None
+
+
+def step_icons(state: dict) -> str | None:
+    if RECOLOR.exists():
+        return run(sys.executable, str(RECOLOR))
+    if RECOLOR_SH.exists():
+        return run("bash", str(RECOLOR_SH))
+    return "missing"
+
+
+def step_waybar(state: dict) -> str | None:
+    return restart("waybar")
+
+
+def step_mako(state: dict) -> str | None:
+    status = restart("mako")
+    if status:
+        return status
+    if shutil.which("makoctl") is None:
+        return "unchecked"
+    # makoctl answers once the new mako owns the notification bus name
+    if not wait_for(lambda: succeeds("makoctl", "mode"), READY_TIMEOUT):
+        return "not ready"
+    return None
+
+
+def step_hyprland(state: dict) -> str | None:
+    return run("hyprctl", "reload")
+
+
+def step_notify(state: dict) -> str | None:
+    title = Path(state["path"]).name
+    return run("notify-send", "-i", state["path"], "Theme Updated", title)
+
+
+# Every step that reads a rendered template needs "templates"; the icons only
+# need colors.json, so they recolour while pywal is still rendering
+STEPS = [
+    Step("wallpaper", (), step_wallpaper),
+    Step("palette", (), step_palette),
+    Step("link", (), step_link),
+    Step("templates", ("palette",), step_templates),
+    Step("icons", ("palette",), step_icons),
+    Step("waybar", ("templates",), step_waybar),
+    Step("mako", ("templates",), step_mako),
+    Step("hyprland", ("templates",), step_hyprland),
+    Step("notify", ("mako",), step_notify),
+]
+
+
+# ── Scheduler ─────────────────────────────────────────────────────────────────
+
+
+def _timed(step: Step, state: dict, t0: float) -> dict:
+    start = time.perf_counter()
+    try:
+        status = step.run(state) or "ok"
+    except Exception as e:
+        status = f"failed: {e}"
+    end = time.perf_counter()
+    return {
+        "start_ms": round((start - t0) * 1000, 1),
+        "ms": round((end - start) * 1000, 1),
+        "status": status,
+    }
+
+
+def run_graph(steps: list[Step], state: dict) -> dict[str, dict]:
+    """Run steps, each once all of its needs are done; their timings by name.
+
+    A failed step still counts as done, so the rest of the switch goes ahead.
+    """
+    t0 = time.perf_counter()
+    waiting = {s.name: s for s in steps}
+    done: dict[str, dict] = {}
+    with ThreadPoolExecutor(len(steps)) as pool:
+        running = {}
+        while waiting or running:
+            for name, s in list(waiting.items()):
+                if all(n in done for n in s.needs):
+                    del waiting[name]
+                    running[pool.submit(_timed, s, state, t0)] = name
+            if not running:
+                raise ValueError(f"unsatisfiable steps: {', '.join(waiting)}")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for f in finished:
+                done[running.pop(f)] = f.result()
+    return {s.name: done[s.name] for s in steps}
+
+
+def log(path: str, timings: dict[str, dict], total: float):
+    entry = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "wallpaper": path,
+        "total_ms": round(total * 1000, 1),
+        "steps": timings,
+    }
+    try:
+        APPLY_LOG.parent.mkdir(parents=True, exist_ok=True)
+        if APPLY_LOG.exists() and APPLY_LOG.stat().st_size > LOG_LIMIT:
+            lines = APPLY_LOG.read_text().splitlines(keepends=True)
+            APPLY_LOG.write_text("".join(lines[len(lines) // 2 :]))
+        with open(APPLY_LOG, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass
+
+
+def main():
+    args = [a for a in sys.argv[1:] if a != "-v"]
+    if len(args) != 1:
+        sys.exit("Usage: python apply.py [-v] <image>")
+    path = str(Path(args[0]).expanduser().absolute())
+    start = time.perf_counter()
+    timings = run_graph(STEPS, {"path": path})
+    total = time.perf_counter() - start
+    log(path, timings, total)
+    if "-v" in sys.argv[1:]:
+        for name, t in sorted(timings.items(), key=lambda kv: kv[1]["start_ms"]):
+            print(
+                f"{name:<10} {t['start_ms']:>8.1f} {t['ms']:>8.1f} ms  {t['status']}",
+                file=sys.stderr,
+            )
+        print(f"{'total':<10} {'':>8} {total * 1000:>8.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
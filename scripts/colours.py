@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+colours.py — colour-similarity index for the wallpaper picker
+One coarse CIELAB histogram per wallpaper, built from the thumbnails wall.py
+already decodes and kept in ~/.cache/wall/colours.npz. Queries rank a whole
+list with a single matrix product.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+from PyQt6 import QtGui
+
+# ── Config ────────────────────────────────────────────────────────────────────
+
+COLOUR_INDEX = Path.home() / ".cache/wall/colours.npz"
+
+# Histogram bins along L*, a*, b*; a* and b* are clipped to ±AB_RANGE
+L_BINS, AB_BINS = 4, 6
+AB_RANGE = 80.0
+STRIDE = 4  # sample every STRIDE-th thumbnail pixel in each direction
+
+# sRGB (D65) → XYZ, and the D65 white point
+_M = np.array(
+    [
+        [0.4124, 0.3576, 0.1805],
+        [0.2126, 0.7152, 0.0722],
+        [0.0193, 0.1192, 0.9505],
+    ],
+    dtype=np.float32,
+)
+_WHITE = np.array([0.9505, 1.0, 1.089], dtype=np.float32)
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+def to_lab(rgb: np.ndarray) -> np.ndarray:
+    """(..., 3) sRGB in 0..1 to CIELAB."""
+    lin = np.where(rgb > 0.04045, ((rgb + 0.055) / 1.055) ** 2.4, rgb / 12.92)
+    xyz = lin @ _M.T / _WHITE
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack(
+        [
+            116 * f[..., 1] - 16,
+            500 * (f[..., 0] - f[..., 1]),
+            200 * (f[..., 1] - f[..., 2]),
+        ],
+        axis=-1,
+    )
+
+
+def _bins(lab: np.ndarray) -> np.ndarray:
+    li = np.clip(lab[..., 0] * (L_BINS / 100), 0, L_BINS - 1).astype(np.intp)
+    ab = np.clip((lab[..., 1:] + AB_RANGE) * (AB_BINS / (2 * AB_RANGE)), 0, AB_BINS - 1)
+    ab = ab.astype(np.intp)
+    return (li * AB_BINS + ab[..., 0]) * AB_BINS + ab[..., 1]
+
+
+def _centres() -> np.ndarray:
+    """Lab centre of every histogram bin, in bin order."""
+    lv = (np.arange(L_BINS) + 0.5) * (100 / L_BINS)
+    ab = (np.arange(AB_BINS) + 0.5) * (2 * AB_RANGE / AB_BINS) - AB_RANGE
+    grid = np.meshgrid(lv, ab, ab, indexing="ij")
+    return np.stack(grid, axis=-1).reshape(-1, 3).astype(np.float32)
+
+
+BINS = L_BINS * AB_BINS * AB_BINS
+CENTRES = _centres()
+
+
+def histogram(img: QtGui.QImage) -> np.ndarray:
+    """Normalised Lab histogram of a thumbnail."""
+    img = img.convertToFormat(QtGui.QImage.Format.Format_RGB32)
+    w, h, stride = img.width(), img.height(), img.bytesPerLine()
+    buf = np.frombuffer(img.constBits().asstring(img.sizeInBytes()), np.uint8)
+    bgrx = buf.reshape(h, stride // 4, 4)[::STRIDE, :w:STRIDE]
+    rgb = bgrx[..., 2::-1].reshape(-1, 3).astype(np.float32) / 255
+    hist = np.bincount(_bins(to_lab(rgb)), minlength=BINS).astype(np.float32)
+    return hist / max(hist.sum(), 1.0)
+
+
+def hex_lab(c: str) -> np.ndarray:
+    rgb = np.array([int(c[i : i + 2], 16) for i in (1, 3, 5)], np.float32) / 255
+    return to_lab(rgb)
+
+
+# ── Index ─────────────────────────────────────────────────────────────────────
+
+
+class ColourIndex:
+    """Per-path Lab histograms, filled from any thread and queried from the GUI.
+
+    Rows are keyed by path and invalidated by file mtime, so the index can
+    be shared by every wallpaper directory the picker has seen. Each row's
+    mtime is checked against the file once per session: rows found stale
+    are left out of queries until add() replaces them.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or COLOUR_INDEX
+        self._lock = threading.Lock()
+        self._rows: dict[str, int] = {}
+        self._mtimes = np.zeros(0, np.float64)
+        self._hists = np.zeros((0, BINS), np.float32)
+        self._roots = self._hists.copy()  # element-wise sqrt, for Hellinger
+        self._count = 0
+        self._checked: dict[int, bool] = {}  # row -> still matches its file
+        self._dirty = False
+        self._load()
+
+    def __contains__(self, path: Path) -> bool:
+        with self._lock:
+            i = self._rows.get(str(path))
+            return i is not None and self._current(i, path)
+
+    def _current(self, i: int, path: Path | str) -> bool:
+        """Whether row i is of path as it is now; stat'ed once per session."""
+        ok = self._checked.get(i)
+        if ok is None:
+            try:
+                ok = bool(self._mtimes[i] == os.stat(path).st_mtime)
+            except OSError:
+                ok = False
+            self._checked[i] = ok
+        return ok
+
+    def add(self, path: Path, img: QtGui.QImage):
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return
+        hist = histogram(img)
+        with self._lock:
+            i = self._rows.get(str(path))
+            if i is None:
+                i = self._rows[str(path)] = self._count
+                self._count += 1
+                if i == len(self._hists):
+                    grow = max(64, len(self._hists))
+                    pad = np.zeros((grow, BINS), np.float32)
+                    self._hists = np.vstack([self._hists, pad])
+                    self._roots = np.vstack([self._roots, pad])
+                    self._mtimes = np.concatenate([self._mtimes, np.zeros(grow)])
+            self._hists[i] = hist
+            self._roots[i] = np.sqrt(hist)
+            self._mtimes[i] = mtime
+            self._checked[i] = True
+            self._dirty = True
+
+    def _matrix(
+        self, images: list[Path], table: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rows of table for images, plus a mask of which ones are current."""
+        with self._lock:
+            rows = [self._rows.get(str(p), -1) for p in images]
+            known = np.array(
+                [i >= 0 and self._current(i, p) for i, p in zip(rows, images)], bool
+            )
+            return table[np.array(rows, np.intp)[known]], known
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def like_image(self, images: list[Path], ref: Path) -> list[int]:
+        """Indices into images, most similar to ref first; unindexed ones last."""
+        with self._lock:
+            i = self._rows.get(str(ref))
+            current = i is not None and self._current(i, ref)
+            target = self._roots[i].copy() if current else None
+        if target is None:
+            return list(range(len(images)))
+        roots, known = self._matrix(images, self._roots)
+        # Hellinger: the square-rooted histograms are unit vectors, so the
+        # distance falls with their dot product
+        return self._ranked(-(roots @ target), known)
+
+    def like_colour(self, images: list[Path], colour: str) -> list[int]:
+        """Indices into images, those made mostly of colour (hex) first."""
+        hists, known = self._matrix(images, self._hists)
+        # Mean ΔE between the image's pixels and the colour, by bin
+        dist = hists @ np.linalg.norm(CENTRES - hex_lab(colour), axis=1)
+        return self._ranked(dist, known)
+
+    @staticmethod
+    def _ranked(dist: np.ndarray, known: np.ndarray) -> list[int]:
+        idx = np.flatnonzero(known)[np.argsort(dist, kind="stable")]
+        rest = np.flatnonzero(~known)
+        return np.concatenate([idx, rest]).tolist()
+
+    # ── Storage ───────────────────────────────────────────────────────────────
+
+    def _load(self):
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                paths, mtimes, hists = data["paths"], data["mtimes"], data["hists"]
+        except (OSError, ValueError, KeyError):
+            return
+        if hists.shape[1:] != (BINS,):
+            return
+        self._rows = {str(p): i for i, p in enumerate(paths)}
+        self._mtimes = mtimes.astype(np.float64)
+        self._hists = hists.astype(np.float32)
+        self._roots = np.sqrt(self._hists)
+        self._count = len(paths)
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            paths = np.array(sorted(self._rows, key=self._rows.get))
+            mtimes = self._mtimes[: self._count].copy()
+            hists = self._hists[: self._count].copy()
+            self._dirty = False
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                np.savez(f, paths=paths, mtimes=mtimes, hists=hists)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
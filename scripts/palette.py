@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+palette.py — native pywal colour backend
+Quantises a downsampled copy of a wallpaper with NumPy k-means and writes a
+pywal-compatible ~/.cache/wal/colors.json, so `wal --theme` only has to
+render templates. Palettes are cached per image content hash.
+Usage: python palette.py <image>
+"""
+
+import colorsys
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# ── Config ────────────────────────────────────────────────────────────────────
+
+WAL_DIR = Path.home() / ".cache/wal"
+WAL_CACHE = WAL_DIR / "colors.json"
+WAL_WALL = WAL_DIR / "wal"
+PALETTE_DIR = Path.home() / ".cache/wall/palettes"
+
+SAMPLE = 96  # longest side of the copy that is quantised (px)
+CLUSTERS = 8  # base colours; pywal's bright row repeats them
+ITERATIONS = 12
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+def image_hash(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def to_hex(rgb) -> str:
+    return "#{:02x}{:02x}{:02x}".format(*(int(c) for c in rgb))
+
+
+def from_hex(c: str) -> tuple[int, int, int]:
+    return int(c[1:3], 16), int(c[3:5], 16), int(c[5:7], 16)
+
+
+def darken(c: str, amount: float) -> str:
+    return to_hex(v * (1 - amount) for v in from_hex(c))
+
+
+def lighten(c: str, amount: float) -> str:
+    return to_hex(v + (255 - v) * amount for v in from_hex(c))
+
+
+def sample_pixels(path: Path) -> np.ndarray:
+    """(N, 3) float32 RGB of a SAMPLE-sized copy; JPEGs are reduced while decoding."""
+    try:
+        with Image.open(path) as im:
+            im.draft("RGB", (SAMPLE, SAMPLE))
+            im = im.convert("RGB")
+            im.thumbnail((SAMPLE, SAMPLE), Image.Resampling.BILINEAR)
+            return np.asarray(im, dtype=np.float32).reshape(-1, 3)
+    except Image.DecompressionBombError as e:
+        # Past Pillow's pixel limit; callers hand it to pywal instead
+        raise ValueError(str(e)) from e
+
+
+# ── Quantiser ─────────────────────────────────────────────────────────────────
+
+
+def kmeans(px: np.ndarray, k: int = CLUSTERS) -> np.ndarray:
+    """k cluster centres of px, most populous first.
+
+    Seeded from luminance quantiles so the result is deterministic.
+    """
+    luma = px @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    order = np.argsort(luma)
+    seeds = order[((np.arange(k) + 0.5) * len(px) / k).astype(int)]
+    centres = px[seeds].copy()
+    labels = np.zeros(len(px), dtype=np.intp)
+    for step in range(ITERATIONS):
+        d = ((px[:, None, :] - centres[None, :, :]) ** 2).sum(axis=2)
+        new = d.argmin(axis=1)
+        if step and np.array_equal(new, labels):
+            break
+        labels = new
+        counts = np.bincount(labels, minlength=k)
+        for ch in range(3):
+            sums = np.bincount(labels, weights=px[:, ch], minlength=k)
+            # Empty clusters keep their previous centre
+            np.divide(sums, counts, out=centres[:, ch], where=counts > 0)
+    counts = np.bincount(labels, minlength=k)
+    return centres[np.argsort(-counts, kind="stable")]
+
+
+def palette(path: Path) -> list[str]:
+    """The 16 terminal colours for path, from the cache when the image is known."""
+    cache = PALETTE_DIR / f"{image_hash(path)}.json"
+    try:
+        return json.loads(cache.read_text())
+    except (OSError, ValueError):
+        pass
+    centres = kmeans(sample_pixels(path))
+    cols = sorted(
+        (to_hex(c) for c in centres),
+        key=lambda c: colorsys.rgb_to_yiq(*(v / 255 for v in from_hex(c))),
+    )
+    # Same shaping as pywal's haiku backend and generic_adjust() (dark theme)
+    raw = [*cols, *cols]
+    raw[0] = lighten(cols[0], 0.40)
+    raw[0] = darken(raw[0], 0.80)
+    raw[7] = lighten(raw[0], 0.75)
+    raw[8] = lighten(raw[0], 0.25)
+    raw[15] = raw[7]
+    try:
+        PALETTE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_name(cache.name + ".tmp")
+        tmp.write_text(json.dumps(raw))
+        os.replace(tmp, cache)
+    except OSError:
+        pass
+    return raw
+
+
+def scheme(path: Path, colors: list[str]) -> dict:
+    """pywal's colors.json layout."""
+    return {
+        "wallpaper": str(path),
+        "alpha": "100",
+        "special": {
+            "background": colors[0],
+            "foreground": colors[15],
+            "cursor": colors[15],
+        },
+        "colors": {f"color{i}": c for i, c in enumerate(colors)},
+    }
+
+
+def apply(path: Path) -> dict:
+    """Write colors.json and the wal file for path; returns the scheme.
+
+    Raises OSError (including undecodable images) or ValueError on failure.
+    """
+    data = scheme(path, palette(path))
+    WAL_DIR.mkdir(parents=True, exist_ok=True)
+    for dest, text in ((WAL_CACHE, json.dumps(data, indent=4)), (WAL_WALL, str(path))):
+        tmp = dest.with_name(dest.name + ".tmp")
+        tmp.write_text(text)
+        os.replace(tmp, dest)
+    return data
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python palette.py <image>")
+    try:
+        apply(Path(sys.argv[1]).expanduser().absolute())
+    except (OSError, ValueError) as e:
+        sys.exit(f"palette.py: {e}")
+
+
+if __name__ == "__main__":
+    main()
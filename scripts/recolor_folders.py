@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+recolor_folders.py — folder icon recolour
+Recolours the Colloid icon theme to pywal's color4 in place. The first run
+indexes the byte offset of every recolourable #rrggbb in every SVG; hex
+colours have a fixed length, so later runs just overwrite those 7 bytes
+through mmap across a process pool, without reading or parsing the files
+again. Files changed behind the index's back are re-indexed.
+Usage: python recolor_folders.py [#rrggbb]
+"""
+
+import json
+import mmap
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# ── Config ────────────────────────────────────────────────────────────────────
+
+ICON_DIR = Path.home() / ".local/share/icons/Colloid-Dynamic-Dark"
+ICON_THEME = "Colloid-Dynamic-Dark"
+WAL_CACHE = Path.home() / ".cache/wal/colors.json"
+PREV_FILE = Path.home() / ".cache/wal/prev_icon_color"  # shared with the .sh
+ICON_INDEX = Path.home() / ".cache/wall/icon-index.json"
+INDEX_VERSION = 1
+
+HEX_RE = re.compile(rb"#[0-9a-fA-F]{6}")
+# Lines holding these keep their colours (highlights and outlines)
+KEEP = (b"#ffffff", b"#333333")
+
+CHUNK = 256  # files per pool task
+POOL_MIN = 512  # fewer files than this are patched in-process
+
+# ── Patching ──────────────────────────────────────────────────────────────────
+
+
+def scan(data: bytes) -> list[int]:
+    """Offsets of the colours the recolour owns, by recolor_folders.sh's rule."""
+    offsets, start = [], 0
+    for line in data.split(b"\n"):
+        if not any(k in line for k in KEEP):
+            offsets.extend(start + m.start() for m in HEX_RE.finditer(line))
+        start += len(line) + 1
+    return offsets
+
+
+def patch(job: tuple[str, str, list]) -> list:
+    """Recolour one chunk; [[rel, mtime_ns, size, offsets, changed], ...].
+
+    job is (root, colour, [[rel, mtime_ns, size, offsets or None], ...]);
+    entries whose stamp no longer matches the file are scanned afresh.
+    """
+    root, colour, entries = job
+    new = colour.encode()
+    out = []
+    for rel, mtime, size, offsets in entries:
+        path = os.path.join(root, rel)
+        try:
+            st = os.stat(path)
+            if offsets is None or [st.st_mtime_ns, st.st_size] != [mtime, size]:
+                with open(path, "rb") as f:
+                    offsets = scan(f.read())
+            changed = False
+            if offsets:
+                with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as mm:
+                    for off in offsets:
+                        if mm[off : off + 7] != new:
+                            mm[off : off + 7] = new
+                            changed = True
+                st = os.stat(path)
+        except (OSError, ValueError):
+            continue  # vanished, unreadable or emptied; dropped from the index
+        out.append([rel, st.st_mtime_ns, st.st_size, offsets, changed])
+    return out
+
+
+# ── Index ─────────────────────────────────────────────────────────────────────
+
+
+def load_index(root: Path) -> dict:
+    try:
+        data = json.loads(ICON_INDEX.read_text())
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != INDEX_VERSION or data.get("root") != str(root):
+        return {}
+    return data.get("files", {})
+
+
+def save_index(root: Path, colour: str, files: dict):
+    data = {"version": INDEX_VERSION, "root": str(root), "colour": colour}
+    data["files"] = files
+    tmp = ICON_INDEX.with_name(ICON_INDEX.name + ".tmp")
+    try:
+        ICON_INDEX.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(data, separators=(",", ":")))
+        os.replace(tmp, ICON_INDEX)
+    except OSError:
+        pass
+
+
+def svgs(root: Path) -> list[str]:
+    """Regular .svg files under root, relative to it.
+
+    Symlinked icons are left alone: recolouring the file they point at is
+    enough, where sed -i would have replaced each link with a copy.
+    """
+    found = []
+    for d, _, names in os.walk(root):
+        for name in names:
+            if name.endswith(".svg"):
+                path = os.path.join(d, name)
+                if not os.path.islink(path):
+                    found.append(os.path.relpath(path, root))
+    return found
+
+
+def recolor(colour: str, root: Path = ICON_DIR) -> int:
+    """Recolour every icon under root to colour; the number of files changed."""
+    known = load_index(root)
+    entries = [[rel, *known.get(rel, (0, 0, None))] for rel in svgs(root)]
+    jobs = [
+        (str(root), colour, entries[i : i + CHUNK])
+        for i in range(0, len(entries), CHUNK)
+    ]
+    if len(entries) < POOL_MIN:
+        results = list(map(patch, jobs))
+    else:
+        with ProcessPoolExecutor() as pool:
+            results = list(pool.map(patch, jobs))
+    files, changed = {}, 0
+    for chunk in results:
+        for rel, mtime, size, offsets, touched in chunk:
+            files[rel] = [mtime, size, offsets]
+            changed += touched
+    save_index(root, colour, files)
+    return changed
+
+
+def quiet(*cmd: str):
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        pass
+
+
+def reload_theme():
+    """Have GTK apps and the file manager pick up the new icons."""
+    quiet("gtk-update-icon-cache", "-f", "-t", str(ICON_DIR))
+    quiet("killall", "tumblerd", "thunar")
+    key = ("org.gnome.desktop.interface", "icon-theme")
+    quiet("gsettings", "set", *key, "Adwaita")
+    time.sleep(0.2)  # GTK coalesces a switch and switch-back that come too fast
+    quiet("gsettings", "set", *key, ICON_THEME)
+
+
+def main():
+    if len(sys.argv) > 1:
+        colour = sys.argv[1]
+    else:
+        try:
+            colour = json.loads(WAL_CACHE.read_text())["colors"]["color4"]
+        except (OSError, ValueError, KeyError) as e:
+            sys.exit(f"recolor_folders.py: no pywal colours: {e}")
+    colour = colour.strip()
+    if not re.fullmatch(r"#[0-9a-fA-F]{6}", colour):
+        sys.exit(f"recolor_folders.py: not a #rrggbb colour: {colour}")
+    if not ICON_DIR.is_dir():
+        sys.exit(f"recolor_folders.py: {ICON_DIR} not found")
+    changed = recolor(colour)
+    try:
+        PREV_FILE.parent.mkdir(parents=True, exist_ok=True)
+        PREV_FILE.write_text(colour + "\n")
+    except OSError:
+        pass
+    if changed:
+        reload_theme()
+
+
+if __name__ == "__main__":
+    main()
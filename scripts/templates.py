@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+templates.py — pywal template renderer
+Renders the user's ~/.config/wal/templates, plus pywal's own when it is
+installed, into ~/.cache/wal from a colour scheme. Templates are parsed once
+into a compiled form cached by mtime; every output is rendered in one pass
+and only rewritten (atomically) when its content hash changed, so programs
+watching an unchanged file are never woken.
+Usage: python templates.py [colors.json]
+"""
+
+import colorsys
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+# ── Config ────────────────────────────────────────────────────────────────────
+
+WAL_DIR = Path.home() / ".cache/wal"
+WAL_CACHE = WAL_DIR / "colors.json"
+USER_TEMPLATES = Path.home() / ".config/wal/templates"
+COMPILED = Path.home() / ".cache/wall/templates.json"
+COMPILED_VERSION = 1
+
+# pywal's marker syntax: {name(.func(args))*(.property)?}, not inside {{ }}
+_MARKER_RE = re.compile(r"(?<!\{)\{([^{}\n]+)\}(?!\})")
+_NAME_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9_]*")
+_CALL_RE = re.compile(r"([a-zA-Z][a-zA-Z0-9_]*)\(([^)]*)\)")
+_NUMBER_RE = re.compile(r"-?\d+(\.\d+)?")
+
+# ── Colour functions (same arithmetic as pywal.util) ──────────────────────────
+
+
+def _rgb(c: str) -> tuple[int, int, int]:
+    return tuple(bytes.fromhex(c.lstrip("#")))
+
+
+def _hex(rgb) -> str:
+    return "#%02x%02x%02x" % tuple(rgb)
+
+
+def _alpha(a) -> int:
+    """pywal's alpha_integrify(): 0.7, 70 and "70" all mean 70 %."""
+    a = abs(float(a))
+    if a < 1:
+        a *= 100
+    return int(min(a, 100))
+
+
+def _saturate(c: str, amount: float) -> str:
+    h, l, _ = colorsys.rgb_to_hls(*(v / 255 for v in _rgb(c)))
+    return _hex(int(v * 255) for v in colorsys.hls_to_rgb(h, l, amount))
+
+
+def _foxify(c: str, f: float) -> str:
+    return _hex(min(max(0, int(v + v * f)), 255) for v in (max(x, 10) for x in _rgb(c)))
+
+
+# Each takes and returns (value, alpha)
+FUNCS = {
+    "lighten": lambda v, a, p: (_hex(int(x + (255 - x) * p / 100) for x in _rgb(v)), a),
+    "darken": lambda v, a, p: (_hex(int(x * (1 - p / 100)) for x in _rgb(v)), a),
+    "saturate": lambda v, a, p: (_saturate(v, p / 100), a),
+    "foxify": lambda v, a, f: (_foxify(v, f), a),
+    "adjust_alpha": lambda v, a, n=100: (v, n),
+}
+
+PROPS = {
+    "rgb": lambda v, a: "%s,%s,%s" % _rgb(v),
+    "rgbspace": lambda v, a: "%s %s %s" % _rgb(v),
+    "xrgba": lambda v, a: "%s%s/%s%s/%s%s/ff" % tuple(v.lower().lstrip("#")),
+    "rgba": lambda v, a: "rgba(%s,%s,%s,%s)" % (*_rgb(v), _alpha(a) / 100),
+    "hex_argb": lambda v, a: "#%02X%s" % (int(_alpha(a) * 255 / 100), v[1:]),
+    "alpha": lambda v, a: "[%s]%s" % (_alpha(a), v),
+    "alpha_dec": lambda v, a: str(_alpha(a) / 100),
+    "alpha_hex": lambda v, a: "%02X" % int(_alpha(a) * 255 / 100),
+    "decimal": lambda v, a: "#%s" % int(v[1:], 16),
+    "decimal_strip": lambda v, a: str(int(v[1:], 16)),
+    "octal": lambda v, a: "#%s" % oct(int(v[1:], 16))[2:],
+    "octal_strip": lambda v, a: oct(int(v[1:], 16))[2:],
+    "strip": lambda v, a: v[1:],
+    "red": lambda v, a: "%.3f" % (_rgb(v)[0] / 255),
+    "green": lambda v, a: "%.3f" % (_rgb(v)[1] / 255),
+    "blue": lambda v, a: "%.3f" % (_rgb(v)[2] / 255),
+    "red_hex": lambda v, a: v[1:3],
+    "green_hex": lambda v, a: v[3:5],
+    "blue_hex": lambda v, a: v[5:],
+    "red_dec": lambda v, a: str(_rgb(v)[0]),
+    "green_dec": lambda v, a: str(_rgb(v)[1]),
+    "blue_dec": lambda v, a: str(_rgb(v)[2]),
+}
+
+# ── Compiler ──────────────────────────────────────────────────────────────────
+
+
+def parse_marker(text: str) -> list | None:
+    """[name, [[func, args], ...], property or None], or None if not a marker."""
+    m = _NAME_RE.match(text)
+    if m is None:
+        return None
+    name, i, funcs, prop = m.group(), m.end(), [], None
+    while i < len(text):
+        if text[i] != "." or prop is not None:
+            return None
+        i += 1
+        call = _CALL_RE.match(text, i)
+        if call:
+            args = []
+            for raw in filter(None, (s.strip() for s in call.group(2).split(","))):
+                num = _NUMBER_RE.match(raw)  # "33%" reads as 33, as in pywal
+                if num is None:
+                    return None
+                args.append(float(num.group()) if num.group(1) else int(num.group()))
+            funcs.append([call.group(1), args])
+            i = call.end()
+            continue
+        m = _NAME_RE.match(text, i)
+        if m is None:
+            return None
+        prop, i = m.group(), m.end()
+    return [name, funcs, prop]
+
+
+def compile_template(text: str) -> list:
+    """Literal strings interleaved with [raw, marker] pairs.
+
+    Anything that isn't a well-formed marker stays literal, and pywal's
+    {{ / }} escapes are resolved here, once.
+    """
+    parts, literal, pos = [], [], 0
+    for m in _MARKER_RE.finditer(text):
+        marker = parse_marker(m.group(1))
+        if marker is None:
+            continue
+        literal.append(text[pos : m.start()])
+        parts.append("".join(literal).replace("{{", "{").replace("}}", "}"))
+        parts.append([m.group(), marker])
+        literal, pos = [], m.end()
+    literal.append(text[pos:])
+    parts.append("".join(literal).replace("{{", "{").replace("}}", "}"))
+    return parts
+
+
+# ── Renderer ──────────────────────────────────────────────────────────────────
+
+
+def flatten(scheme: dict) -> dict[str, str]:
+    """Marker names to values, as pywal's export.flatten_colors() lays them out."""
+    return {
+        "wallpaper": str(scheme.get("wallpaper", "None")),
+        "checksum": str(scheme.get("checksum", "None")),
+        "alpha": str(scheme.get("alpha", "100")),
+        **scheme["special"],
+        **scheme["colors"],
+    }
+
+
+def evaluate(marker: list, values: dict[str, str], alpha: str) -> str | None:
+    name, funcs, prop = marker
+    if name not in values:
+        return None
+    value, a = values[name], alpha
+    try:
+        for fname, args in funcs:
+            value, a = FUNCS[fname](value, a, *args)
+        return PROPS[prop](value, a) if prop else value
+    except (KeyError, TypeError, ValueError, IndexError):
+        return None
+
+
+def render(parts: list, values: dict[str, str], alpha: str, memo: dict) -> str:
+    out = []
+    for part in parts:
+        if isinstance(part, str):
+            out.append(part)
+            continue
+        raw, marker = part
+        if raw not in memo:
+            v = evaluate(marker, values, alpha)
+            # Unknown colours and functions are left as written, like pywal
+            memo[raw] = raw if v is None else v
+        out.append(memo[raw])
+    return "".join(out)
+
+
+def template_dirs() -> list[Path]:
+    """pywal's bundled templates, when installed, then the user's (which win)."""
+    dirs = []
+    spec = importlib.util.find_spec("pywal")
+    if spec is not None and spec.origin:
+        dirs.append(Path(spec.origin).parent / "templates")
+    dirs.append(USER_TEMPLATES)
+    return dirs
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class Renderer:
+    """Compiled templates and the hashes of what was last written, kept on disk."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or COMPILED
+        self._templates: dict[str, dict] = {}
+        self._outputs: dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def compiled(self, src: Path) -> list | None:
+        try:
+            st = src.stat()
+        except OSError:
+            return None
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = self._templates.get(str(src))
+        if entry is None or entry["stat"] != stamp:
+            try:
+                text = src.read_text(encoding="utf-8", errors="surrogateescape")
+            except OSError:
+                return None
+            entry = self._templates[str(src)] = {
+                "stat": stamp,
+                "parts": compile_template(text),
+            }
+            self._dirty = True
+        return entry["parts"]
+
+    def write(self, dest: Path, text: str) -> bool:
+        """Replace dest with text unless it already holds exactly that."""
+        data = text.encode("utf-8", errors="surrogateescape")
+        digest = _digest(data)
+        rec = self._outputs.get(str(dest))
+        try:
+            st = dest.stat()
+        except OSError:
+            st = None
+        if st is not None:
+            stamp = [st.st_mtime_ns, st.st_size]
+            # Known file, untouched since we wrote it: no need to read it
+            if rec and rec["stat"] == stamp and rec["hash"] == digest:
+                return False
+            if st.st_size == len(data) and _digest(dest.read_bytes()) == digest:
+                self._outputs[str(dest)] = {"stat": stamp, "hash": digest}
+                self._dirty = True
+                return False
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.tmp")
+        tmp.write_bytes(data)
+        if st is not None:
+            os.chmod(tmp, st.st_mode & 0o7777)
+        os.replace(tmp, dest)
+        st = dest.stat()
+        self._outputs[str(dest)] = {
+            "stat": [st.st_mtime_ns, st.st_size],
+            "hash": digest,
+        }
+        self._dirty = True
+        return True
+
+    def render_all(
+        self, scheme: dict, dirs: list[Path] | None = None, out: Path | None = None
+    ) -> list[Path]:
+        """Render every template for scheme into out; the paths that changed."""
+        out = out or WAL_DIR
+        values = flatten(scheme)
+        alpha = values["alpha"]
+        sources: dict[Path, Path] = {}
+        for d in dirs or template_dirs():
+            for root, _, files in os.walk(d):
+                for name in files:
+                    if name == ".DS_Store" or name.endswith(".swp"):
+                        continue
+                    src = Path(root) / name
+                    sources[out / src.relative_to(d)] = src
+
+        memo: dict[str, str] = {}  # markers repeat across templates
+        changed = []
+        for dest, src in sources.items():
+            parts = self.compiled(src)
+            if parts is None:
+                continue
+            try:
+                if self.write(dest, render(parts, values, alpha, memo)):
+                    changed.append(dest)
+            except OSError as e:
+                print(f"templates.py: {dest}: {e}", file=sys.stderr)
+        self.save()
+        return changed
+
+    # ── Storage ───────────────────────────────────────────────────────────────
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") != COMPILED_VERSION:
+            return
+        self._templates = data.get("templates", {})
+        self._outputs = data.get("outputs", {})
+
+    def save(self):
+        if not self._dirty:
+            return
+        data = {
+            "version": COMPILED_VERSION,
+            "templates": self._templates,
+            "outputs": self._outputs,
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data))
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError:
+            pass
+
+
+def main():
+    src = Path(sys.argv[1]).expanduser() if len(sys.argv) > 1 else WAL_CACHE
+    try:
+        scheme = json.loads(src.read_text())
+    except (OSError, ValueError) as e:
+        sys.exit(f"templates.py: {e}")
+    changed = Renderer().render_all(scheme)
+    print(f"templates.py: {len(changed)} file(s) changed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+tracing.py — startup tracer
+Times the phases of a script's startup, from the moment its process was
+created to its first frame on screen, and writes them as a Chrome trace
+(open in ui.perfetto.dev or chrome://tracing). Imported before PyQt, so the
+import itself can be timed. Off, at the cost of one env lookup, unless the
+script's variable is set: WALL_TRACE=1 (or APP_TRACE=1) writes
+~/.cache/traces/<name>-<time>.json; any other value is the file to write.
+Usage: python tracing.py <trace.json>   (prints a phase summary)
+"""
+
+import contextlib
+import functools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from pathlib import Path
+
+# ── Config ────────────────────────────────────────────────────────────────────
+
+TRACE_DIR = Path.home() / ".cache/traces"
+
+# ── Clock ─────────────────────────────────────────────────────────────────────
+
+
+def process_start() -> float:
+    """When this process was created, on the perf_counter() clock.
+
+    The kernel records the start in clock ticks since boot; interpreter
+    start-up and the imports before this module are counted from there.
+    """
+    now = time.perf_counter()
+    try:
+        with open("/proc/self/stat") as f:
+            ticks = int(f.read().rpartition(")")[2].split()[19])
+        age = time.clock_gettime(time.CLOCK_BOOTTIME) - ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return now  # not Linux: start counting here instead
+    return now - max(0.0, age)
+
+
+# ── Tracer ────────────────────────────────────────────────────────────────────
+
+
+class Tracer:
+    """Collects trace events until the first frame, then writes them once.
+
+    phase() and timed() nest, so a phase inside another shows up beneath it;
+    events from worker threads get their own track. When disabled, phase()
+    hands back one shared no-op context and timed() returns the function
+    untouched.
+    """
+
+    def __init__(self, name: str, env: str):
+        value = os.environ.get(env, "")
+        self.name = name
+        self.enabled = value not in ("", "0")
+        self.path: Path | None = None
+        if self.enabled:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            self.path = (
+                TRACE_DIR / f"{name}-{stamp}.json"
+                if value == "1"
+                else Path(value).expanduser()
+            )
+        self.t0 = process_start()
+        self._events: list[dict] = []
+        self._lock = threading.Lock()
+        self._frame_pending = False
+        if self.enabled:
+            self._complete("python start-up", self.t0, time.perf_counter())
+
+    def _us(self, t: float) -> float:
+        return round((t - self.t0) * 1e6, 1)
+
+    def _add(self, event: dict):
+        if not self.enabled:
+            return  # written already: a resident process keeps running
+        event.setdefault("pid", os.getpid())
+        event.setdefault("tid", threading.get_native_id())
+        with self._lock:
+            self._events.append(event)
+
+    def _complete(self, name: str, start: float, end: float, **args):
+        event = {"name": name, "ph": "X", "ts": self._us(start)}
+        event["dur"] = round((end - start) * 1e6, 1)
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    def phase(self, name: str, **args):
+        """Context manager timing the enclosed block as one phase."""
+        if not self.enabled:
+            return _NULL
+        return self._phase(name, args)
+
+    @contextlib.contextmanager
+    def _phase(self, name: str, args: dict):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._complete(name, start, time.perf_counter(), **args)
+
+    def timed(self, fn=None, *, name: str | None = None):
+        """Decorator timing every call of fn, named after it by default."""
+        if fn is None:
+            return functools.partial(self.timed, name=name)
+        if not self.enabled:
+            return fn
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            if not self.enabled:
+                return fn(*a, **kw)
+            with self._phase(label, {}):
+                return fn(*a, **kw)
+
+        return wrapper
+
+    def mark(self, name: str, **args):
+        """A zero-length event at this moment."""
+        if not self.enabled:
+            return
+        event = {"name": name, "ph": "i", "s": "p", "ts": self._us(time.perf_counter())}
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    def until_frame(self, widget):
+        """Write the trace once widget has painted and its frame went out.
+
+        The first paint event is timed from its arrival until the event
+        loop comes back round, by which point the backing store has been
+        flushed to the compositor.
+        """
+        if not self.enabled or self._frame_pending:
+            return
+        from PyQt6 import QtCore
+
+        tracer = self
+
+        class FirstPaint(QtCore.QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QtCore.QEvent.Type.Paint:
+                    obj.removeEventFilter(self)
+                    start = time.perf_counter()
+
+                    def done():
+                        tracer._complete("first frame", start, time.perf_counter())
+                        tracer.dump()
+
+                    QtCore.QTimer.singleShot(0, done)
+                return False
+
+        self._frame_pending = True
+        self._filter = FirstPaint(widget)
+        widget.installEventFilter(self._filter)
+
+    def dump(self):
+        """Write the trace, once; later events are not recorded."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        with self._lock:
+            events, self._events = self._events, []
+        names = {e["tid"] for e in events}
+        meta = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "args": {"name": self.name},
+            }
+        ]
+        for tid in sorted(names):
+            label = (
+                "main" if tid == threading.main_thread().native_id else f"thread {tid}"
+            )
+            meta.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"name": label},
+                }
+            )
+        data = {
+            "traceEvents": meta + events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "script": self.name,
+                "argv": sys.argv,
+                "host": platform.node(),
+                "kernel": platform.release(),
+                "python": platform.python_version(),
+                "qt": _qt_version(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"tracing.py: {self.path}: {e}", file=sys.stderr)
+            return
+        print(f"{self.name}: startup trace written to {self.path}", file=sys.stderr)
+
+
+_NULL = contextlib.nullcontext()
+
+
+def _qt_version() -> str | None:
+    qt = sys.modules.get("PyQt6.QtCore")
+    return qt.QT_VERSION_STR if qt else None
+
+
+# ── Summary ───────────────────────────────────────────────────────────────────
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python tracing.py <trace.json>")
+    try:
+        data = json.loads(Path(sys.argv[1]).read_text())
+    except (OSError, ValueError) as e:
+        sys.exit(f"tracing.py: {e}")
+    main_tid = next(
+        (
+            e["tid"]
+            for e in data["traceEvents"]
+            if e.get("args", {}).get("name") == "main"
+        ),
+        None,
+    )
+    spans = sorted(
+        (e for e in data["traceEvents"] if e["ph"] == "X"),
+        key=lambda e: (e["ts"], -e["dur"]),
+    )
+    # Indent each phase under the one enclosing it on the same thread, and
+    # fold runs of the same call (one icon lookup per app, say) into a line
+    stack: dict[int, list[float]] = {}
+    rows: list[list] = []  # [tid, depth, name, start, total, calls]
+    for e in spans:
+        ends = stack.setdefault(e["tid"], [])
+        while ends and ends[-1] <= e["ts"]:
+            ends.pop()
+        row = rows[-1] if rows else None
+        if row and row[:3] == [e["tid"], len(ends), e["name"]]:
+            row[4] += e["dur"]
+            row[5] += 1
+        else:
+            rows.append([e["tid"], len(ends), e["name"], e["ts"], e["dur"], 1])
+        ends.append(e["ts"] + e["dur"])
+    for tid, depth, name, start, total, calls in rows:
+        where = "" if tid == main_tid else f"  [thread {tid}]"
+        times = f" ×{calls}" if calls > 1 else ""
+        print(
+            f"{start / 1000:>9.1f} {total / 1000:>9.1f} ms  "
+            f"{'  ' * depth}{name}{times}{where}"
+        )
+
+
+if __name__ == "__main__":
+    main()
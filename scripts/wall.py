@@ -2,25 +2,88 @@
 """
 wall.py — carousel wallpaper picker
 Parallelogram cards, centre card enlarged, scroll with keys/wheel/click.
-Usage: python wall.py [wallpaper_dir]
+Usage: python wall.py [--daemon] [wallpaper_dir]
+
+With --daemon the carousel stays resident and hidden; later plain
+invocations just toggle it over a Unix socket instead of starting up.
 """
 
+import bisect
+import fcntl
+import hashlib
+import itertools
 import json
+import math
+import mmap
+import multiprocessing
+import os
+import re
+import socket
 import subprocess
 import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
 from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import quote_from_bytes
+
+import tracing
+
+# Startup phases, written as a Chrome trace when WALL_TRACE is set
+TRACE = tracing.Tracer("wall", "WALL_TRACE")
+
+# ── Daemon client ─────────────────────────────────────────────────────────────
+
+SOCKET = Path(os.environ.get("XDG_RUNTIME_DIR") or "/tmp") / "wall.sock"
 
-from PyQt6 import QtCore, QtGui, QtWidgets
+
+def daemon_request(line: str) -> str | None:
+    """Send one command line to a running daemon; its reply, or None if absent."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(2.0)
+            s.connect(str(SOCKET))
+            s.sendall(line.encode() + b"\n")
+            return s.makefile().readline().strip()
+    except OSError:
+        return None
+
+
+# Hand off to a resident carousel before paying for the PyQt imports; fall
+# through to a normal start when there is none (or it has no wallpapers).
+if __name__ == "__main__" and "--daemon" not in sys.argv[1:]:
+    _dirs = [a for a in sys.argv[1:] if not a.startswith("--")]
+    _dir = os.path.abspath(os.path.expanduser(_dirs[0])) if _dirs else ""
+    with TRACE.phase("daemon handoff"):
+        _handed_off = daemon_request(f"toggle\t{_dir}") == "ok"
+    if _handed_off:
+        sys.exit(0)
+
+with TRACE.phase("import PyQt6"):
+    from PyQt6 import QtCore, QtGui, QtNetwork, QtWidgets
 
 # ── Config ────────────────────────────────────────────────────────────────────
 
+ARGS = [a for a in sys.argv[1:] if not a.startswith("--")]
 WALLPAPER_DIR = (
-    Path(sys.argv[1]) if len(sys.argv) > 1 else Path.home() / "Pictures/Wallpapers"
+    Path(ARGS[0]).expanduser().absolute()
+    if ARGS
+    else Path.home() / "Pictures/Wallpapers"
 )
 FONT = "Hack Nerd Font"
 SETWALL = Path.home() / ".config/scripts/setwall.sh"
 WAL_CACHE = Path.home() / ".cache/wal/colors.json"
 WAL_WALL = Path.home() / ".cache/wal/wal"
+CACHE_DIR = Path.home() / ".cache/wall"
+THUMB_PACK = CACHE_DIR / "thumbs.pack"
+THUMB_INDEX = CACHE_DIR / "thumbs.json"
+WALL_INDEX = CACHE_DIR / "index.json"
+# The last settled frame, shown on the next launch until the live one is ready
+SNAPSHOT = CACHE_DIR / "snapshot.bin"
+SNAPSHOT_LIVE_MS = 1500  # go live by then even if thumbnails are missing
 
 # Card dimensions
 CARD_W = 160  # base card width (before scale)
@@ -33,16 +96,103 @@ VISIBLE = (
     6  # cards each side of centre that are drawn (was 8; beyond 6 are invisible anyway)
 )
 
-# Animation — spring strength (0.12 = gentle, 0.22 = snappy)
+# Cards are laid out per 1/SPRITE_STEPS of a card of travel, but sprites are
+# only rendered SPRITE_LEVELS times per card; in between, the next larger one
+# is drawn scaled down. The sprite cache holds at most SPRITE_BUDGET_MB.
+SPRITE_STEPS = 32
+SPRITE_LEVELS = 4  # divides SPRITE_STEPS
+SPRITE_BUDGET_MB = 48
+
+# Window-sized backgrounds kept decoded, and how long the carousel must rest
+# before the centre card's background is committed
+BG_CACHE_SIZE = 8
+BG_SETTLE_MS = 120
+
+# Animation — spring strength (0.12 = gentle, 0.22 = snappy): the fraction
+# of the remaining distance covered per 8 ms. It is integrated over real frame
+# time, so motion is the same at any refresh rate.
 SPRING = 0.16
+SPRING_RATE = -math.log(1 - SPRING) / 0.008  # per second
 
 # Window
 WIN_W = 1100
 WIN_H = 520
+HINT = (
+    "← → / hjkl / scroll   ·   Enter to set   ·   "
+    "c / v / n  like this · like theme · by name   ·   / search   ·   Esc to close"
+)
+
+# Thumbnails are cropped once to the largest card (centre card plus its skew)
+THUMB_W = int(CARD_W * CENTER_SCALE) + int(CARD_W * CENTER_SCALE * SKEW) + 10
+THUMB_H = int(CARD_H * CENTER_SCALE) + 10
+THUMB_FMT = QtGui.QImage.Format.Format_ARGB32_Premultiplied
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".gif"}
+
+# Animated GIF/WebP play on the centre card once it settles; every other
+# card shows the first frame
+ANIM_EXTS = {".gif", ".webp"}
+ANIM_FRAMES = 4  # decoded frames held ahead of the one on screen
+ANIM_DEFAULT_MS = 100  # for frames with no delay (or ≤10 ms), as browsers do
+ANIM_POLL_MS = 10  # retry interval while the decoder catches up
+
+# Coalesce directory change notifications for this long before re-listing,
+# and rewrite the manifest only once they have stopped for INDEX_SAVE_MS. It
+# is only a cache: a directory whose mtime moved is re-listed on start.
+INDEX_SETTLE_MS = 200
+INDEX_SAVE_MS = 5000
+
+# Rewrite the thumbnail pack once this fraction of it is stale
+COMPACT_RATIO = 0.25
+
+# Thumbnail memory budget (MB). Pixmaps near the centre stay decoded; the
+# rest are demoted to JPEG bytes, and dropped once those overflow too.
+THUMB_BUDGET_MB = 96
+HOT_SHARE = 0.75  # fraction of the budget for decoded pixmaps
+
+# Largest decode buffer allowed per image (MB) — an 8K ARGB frame is ~130 MB.
+# Bigger files are read in bands, or through Pillow in their native depth.
+DECODE_LIMIT_MB = 192
+
+# Decode worker processes — one core is left for the GUI; each worker carries
+# its own PyQt import (~40 MB), hence the cap
+DECODE_WORKERS = min(8, max(1, (os.cpu_count() or 1) - 1))
+
+# Frame timing: WALL_PROFILE=1 records paint times and dumps them to
+# PROFILE_OUT when the carousel closes; WALL_PROFILE=overlay also shows them
+PROFILE = os.environ.get("WALL_PROFILE", "")
+PROFILE_OUT = CACHE_DIR / "frames.json"
+
+# "quick" renders through the Qt Quick scene graph (wall_quick.py) instead of
+# QPainter; QT_QUICK_BACKEND=software keeps that working without a GPU
+RENDERER = os.environ.get("WALL_RENDERER", "")
+
+# Queued decodes further than this many cards from the centre are cancelled
+CANCEL_RADIUS = VISIBLE * 3
+
+# freedesktop.org shared thumbnails (the ones Thunar/tumbler write) are used
+# in place of originals when fresh and big enough for a card. With
+# WALL_SHARE_THUMBS=1, originals decoded here are written back for them.
+XDG_CACHE = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+SHARED_THUMBS = XDG_CACHE / "thumbnails"
+SHARED_SIZES = (("normal", 128), ("large", 256), ("x-large", 512), ("xx-large", 1024))
+SHARE_THUMBS = os.environ.get("WALL_SHARE_THUMBS", "") == "1"
+# Upscale allowed on one when none covers the card: a 16:9 x-large (512×288)
+# is 1.24× short of a 1× card, and tumbler seldom writes xx-large
+SHARED_UPSCALE = 1.25
+
+# Screen-sized copies of wallpapers, so the backend never resamples on apply.
+# Made for a centre card once the carousel has rested on it VARIANT_IDLE_MS;
+# oldest are pruned past the budget.
+VARIANT_DIR = CACHE_DIR / "variants"
+VARIANT_BUDGET_MB = 512
+VARIANT_IDLE_MS = 1500
+VARIANT_QUALITY = 95  # JPEG and lossy WebP sources; the rest are kept as PNG
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 
+@TRACE.timed
 def load_pywal() -> tuple[str, str, str, str]:
     defaults = ("#1a1a1a", "#c0caf5", "#7aa2f7", "#bb9af7")
     if not WAL_CACHE.exists():
@@ -59,35 +209,358 @@ def load_pywal() -> tuple[str, str, str, str]:
         return defaults
 
 
+@TRACE.timed
 def current_wall() -> str | None:
     return WAL_WALL.read_text().strip() if WAL_WALL.exists() else None
 
 
-def load_images(directory: Path) -> list[Path]:
-    if not directory.exists():
-        return []
-    exts = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
-    return sorted(
-        [p for p in directory.iterdir() if p.suffix.lower() in exts],
-        key=lambda p: p.name.lower(),
-    )
+def device_pixel_ratio() -> float:
+    screen = QtGui.QGuiApplication.primaryScreen()
+    return screen.devicePixelRatio() if screen else 1.0
+
+
+def read_scaled(path: Path, w: int, h: int) -> QtGui.QImage:
+    """Decode at the smallest size that still covers w×h; null image on failure.
+
+    JPEG scales inside the DCT, so its full-resolution pixels never exist.
+    Anything whose full decode would pass DECODE_LIMIT_MB is read in bands
+    when the format allows clipping, otherwise via Pillow's reduce().
+    """
+    reader = QtGui.QImageReader(str(path))
+    reader.setAutoTransform(True)
+    reader.setAllocationLimit(DECODE_LIMIT_MB)
+    size = reader.size()
+    if not size.isValid():
+        return reader.read()
+    # The scaled size applies before EXIF rotation
+    if (
+        reader.transformation()
+        & QtGui.QImageIOHandler.Transformation.TransformationRotate90
+    ):
+        w, h = h, w
+    sw, sh = size.width(), size.height()
+    scale = min(1.0, max(w / sw, h / sh))
+    target = QtCore.QSize(max(1, math.ceil(sw * scale)), max(1, math.ceil(sh * scale)))
+    if scale < 1.0:
+        reader.setScaledSize(target)
+    img = reader.read()
+    if not img.isNull() or sw * sh * 4 <= DECODE_LIMIT_MB << 20:
+        return img
+    if reader.supportsOption(QtGui.QImageIOHandler.ImageOption.ClipRect):
+        return _read_banded(path, size, target)
+    return _read_reduced(path, target)
+
+
+def _read_banded(path: Path, size: QtCore.QSize, target: QtCore.QSize) -> QtGui.QImage:
+    """Decode horizontal strips that each fit the cap and scale them into place."""
+    sw, sh = size.width(), size.height()
+    band = max(1, (DECODE_LIMIT_MB << 20) // (sw * 4 * 2))
+    out = QtGui.QImage(target, THUMB_FMT)
+    p = QtGui.QPainter(out)
+    p.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform)
+    ky = target.height() / sh
+    for y in range(0, sh, band):
+        bh = min(band, sh - y)
+        reader = QtGui.QImageReader(str(path))
+        reader.setAllocationLimit(DECODE_LIMIT_MB)
+        reader.setClipRect(QtCore.QRect(0, y, sw, bh))
+        strip = reader.read()
+        if strip.isNull():
+            p.end()
+            return QtGui.QImage()
+        top, bottom = round(y * ky), round((y + bh) * ky)
+        p.drawImage(QtCore.QRect(0, top, target.width(), bottom - top), strip)
+    p.end()
+    return out
+
+
+def _read_reduced(path: Path, target: QtCore.QSize) -> QtGui.QImage:
+    """Pillow keeps the file's native depth (often 1–3 bytes a pixel) until reduce()."""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return QtGui.QImage()
+    try:
+        with Image.open(path) as im:
+            im.draft("RGB", (target.width(), target.height()))
+            if im.width * im.height * len(im.getbands()) > DECODE_LIMIT_MB << 20:
+                return QtGui.QImage()
+            factor = max(
+                1, min(im.width // target.width(), im.height // target.height())
+            )
+            im = ImageOps.exif_transpose(im.reduce(factor)).convert("RGBA")
+            data = im.tobytes()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return QtGui.QImage()
+    fmt = QtGui.QImage.Format.Format_RGBA8888
+    return QtGui.QImage(data, im.width, im.height, im.width * 4, fmt).copy()
+
+
+def crop_image(path: Path, w: int, h: int) -> QtGui.QImage:
+    """Cover-scale and centre-crop to w×h. QImage only, so safe in worker processes."""
+    return cover_crop(read_scaled(path, w, h), w, h)
 
 
-def scaled_crop(path: Path, w: int, h: int) -> QtGui.QPixmap:
-    px = QtGui.QPixmap(str(path))
-    if px.isNull():
-        blank = QtGui.QPixmap(w, h)
+def cover_crop(img: QtGui.QImage, w: int, h: int) -> QtGui.QImage:
+    if img.isNull():
+        blank = QtGui.QImage(w, h, THUMB_FMT)
         blank.fill(QtGui.QColor(30, 30, 40))
         return blank
-    scaled = px.scaled(
-        w,
-        h,
-        QtCore.Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-        QtCore.Qt.TransformationMode.SmoothTransformation,
-    )
-    x = (scaled.width() - w) // 2
-    y = (scaled.height() - h) // 2
-    return scaled.copy(x, y, w, h)
+    # read_scaled already lands within a pixel of covering w×h unless the
+    # source was smaller than the card, which still needs an upscale
+    if (
+        img.width() < w
+        or img.height() < h
+        or min(img.width() - w, img.height() - h) > 1
+    ):
+        img = img.scaled(
+            w,
+            h,
+            QtCore.Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+            QtCore.Qt.TransformationMode.SmoothTransformation,
+        )
+    x = (img.width() - w) // 2
+    y = (img.height() - h) // 2
+    return img.copy(x, y, w, h)
+
+
+def card_image(path: Path, w: int, h: int) -> QtGui.QImage:
+    """crop_image(), starting from a shared thumbnail whenever one will do."""
+    img = read_shared(path, w, h)
+    if img is None and SHARE_THUMBS:
+        img = write_shared(path, w, h)
+    if img is None:
+        return crop_image(path, w, h)
+    return cover_crop(img, w, h)
+
+
+# ── Shared thumbnails ─────────────────────────────────────────────────────────
+
+
+def shared_uri(path: Path) -> str:
+    # Escaped like GLib's g_filename_to_uri(), which tumbler hashes; Python's
+    # as_uri() also escapes sub-delimiters and would miss names with them
+    raw = os.fsencode(path.absolute())
+    return "file://" + quote_from_bytes(raw, safe="/!$&'()*+,;=:@")
+
+
+def shared_name(uri: str) -> str:
+    return hashlib.md5(uri.encode()).hexdigest() + ".png"
+
+
+def read_shared(path: Path, w: int, h: int) -> QtGui.QImage | None:
+    """The smallest fresh shared thumbnail of path that covers w×h, if any.
+
+    Failing that, the largest one within SHARED_UPSCALE of covering it.
+    """
+    try:
+        mtime = int(os.stat(path).st_mtime)
+    except OSError:
+        return None
+    uri = shared_uri(path)
+    name = shared_name(uri)
+    found = []  # (upscale, reader), only headers read so far
+    for size, n in SHARED_SIZES:
+        if n * SHARED_UPSCALE < max(w, h):
+            continue
+        reader = QtGui.QImageReader(str(SHARED_THUMBS / size / name), b"png")
+        dims = reader.size()
+        if not dims.isValid():
+            continue
+        k = max(w / dims.width(), h / dims.height())
+        if k <= SHARED_UPSCALE:
+            found.append((max(k, 1.0), reader))
+    # Stable: among those that cover, the smallest stays first
+    for _, reader in sorted(found, key=lambda c: c[0]):
+        # QImageReader.text() splits keys at ':', so the keys are read from
+        # the decoded image. Stale or foreign (hash collision) thumbnails are
+        # skipped, not removed — the file manager owns them.
+        img = reader.read()
+        stamp, owner = img.text("Thumb::MTime"), img.text("Thumb::URI")
+        if not img.isNull() and stamp == str(mtime) and owner in ("", uri):
+            return img
+    return None
+
+
+def write_shared(path: Path, w: int, h: int) -> QtGui.QImage | None:
+    """Decode path at the smallest spec size that covers w×h and save it there.
+
+    Returns the decoded image, or None when no spec size is large enough
+    (the caller then decodes for the card alone) or on failure.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    reader = QtGui.QImageReader(str(path))
+    dims = reader.size()
+    if not dims.isValid():
+        return None
+    sw, sh = dims.width(), dims.height()
+    if (
+        reader.transformation()
+        & QtGui.QImageIOHandler.Transformation.TransformationRotate90
+    ):
+        sw, sh = sh, sw
+    for size, n in SHARED_SIZES:
+        # The spec fits the image inside n×n and never upscales
+        k = min(1.0, n / max(sw, sh))
+        tw, th = round(sw * k), round(sh * k)
+        if tw >= w and th >= h:
+            break
+    else:
+        return None
+    img = read_scaled(path, tw, th)
+    if img.isNull():
+        return None
+    if img.width() > n or img.height() > n:
+        img = img.scaled(
+            n,
+            n,
+            QtCore.Qt.AspectRatioMode.KeepAspectRatio,
+            QtCore.Qt.TransformationMode.SmoothTransformation,
+        )
+    uri = shared_uri(path)
+    img.setText("Thumb::URI", uri)
+    img.setText("Thumb::MTime", str(int(st.st_mtime)))
+    img.setText("Thumb::Size", str(st.st_size))
+    img.setText("Thumb::Image::Width", str(sw))
+    img.setText("Thumb::Image::Height", str(sh))
+    img.setText("Software", "wall.py")
+    dest = SHARED_THUMBS / size / shared_name(uri)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}")
+    try:
+        dest.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Written privately and renamed into place, as the spec asks
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.close(fd)
+        if img.save(str(tmp), "PNG"):
+            os.replace(tmp, dest)
+        else:
+            tmp.unlink(missing_ok=True)
+    except OSError:
+        pass
+    return img
+
+
+# ── Card layout ───────────────────────────────────────────────────────────────
+
+
+class CardGeom(NamedTuple):
+    cw: int  # card width before skew
+    ch: int
+    skew: int  # horizontal lean in px
+    total_w: int  # cw + skew
+    alpha: float
+    darkness: int  # side-card shade, 0–140
+
+
+def card_geom(adist: float) -> CardGeom:
+    """Size and shading of a card |adist| slots from the centre."""
+    t = min(adist, 1.0)
+    scale = CENTER_SCALE + (SIDE_SCALE - CENTER_SCALE) * t
+    if adist > 1.0:
+        scale = SIDE_SCALE * max(0.0, 1.0 - (adist - 1.0) * 0.22)
+    cw = int(CARD_W * scale)
+    ch = int(CARD_H * scale)
+    skew = int(cw * SKEW)
+    darkness = int(min(adist, 1.5) / 1.5 * 140) if adist > 0.05 else 0
+    return CardGeom(cw, ch, skew, cw + skew, max(0.0, 1.0 - adist * 0.17), darkness)
+
+
+# Geometry per quantised distance, shared by painting, sprites and hit-testing
+LAYOUT = [card_geom(q / SPRITE_STEPS) for q in range((VISIBLE + 1) * SPRITE_STEPS + 1)]
+
+
+def sprite_level(q: int) -> int:
+    """The sprite level drawn for layout level q: the nearest one at or inside it.
+
+    Cards shrink away from the centre, so that sprite is never upscaled.
+    """
+    return q - q % (SPRITE_STEPS // SPRITE_LEVELS)
+
+
+def card_path(x0: float, y0: float, g: CardGeom) -> QtGui.QPainterPath:
+    path = QtGui.QPainterPath()
+    path.moveTo(x0 + g.skew, y0)
+    path.lineTo(x0 + g.skew + g.cw, y0)
+    path.lineTo(x0 + g.cw, y0 + g.ch)
+    path.lineTo(x0, y0 + g.ch)
+    path.closeSubpath()
+    return path
+
+
+class SpriteCache:
+    """Ready-to-blit parallelogram cards keyed by (thumbnail, sprite level).
+
+    Each sprite has the clip, cover-scale and side darkening baked in, so a
+    frame only blits them with an opacity. Sprites are keyed on the pixmap's
+    cacheKey, so a re-decoded thumbnail never reuses a stale one.
+    """
+
+    def __init__(self, dpr: float = 1.0, budget_mb: int | None = None):
+        self.dpr = dpr
+        self.budget = (budget_mb or SPRITE_BUDGET_MB) << 20
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._sprites: OrderedDict[tuple[int, int], QtGui.QPixmap] = OrderedDict()
+
+    def get(self, src: QtGui.QPixmap | None, q: int) -> QtGui.QPixmap:
+        key = (src.cacheKey() if src is not None else 0, q)
+        px = self._sprites.get(key)
+        if px is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return px
+        self.misses += 1
+        px = self._render(src, LAYOUT[q])
+        self._sprites[key] = px
+        self.bytes += px.width() * px.height() * 4
+        while self.bytes > self.budget and len(self._sprites) > 1:
+            _, old = self._sprites.popitem(last=False)
+            self.bytes -= old.width() * old.height() * 4
+        return px
+
+    def render(self, src: QtGui.QPixmap, q: int) -> QtGui.QPixmap:
+        """A sprite for a pixmap shown once, like an animation frame; not cached."""
+        return self._render(src, LAYOUT[q])
+
+    def clear(self):
+        self._sprites.clear()
+        self.bytes = 0
+
+    @TRACE.timed
+    def _render(self, src: QtGui.QPixmap | None, g: CardGeom) -> QtGui.QPixmap:
+        px = QtGui.QPixmap(
+            max(1, math.ceil(g.total_w * self.dpr)), max(1, math.ceil(g.ch * self.dpr))
+        )
+        px.setDevicePixelRatio(self.dpr)
+        px.fill(QtCore.Qt.GlobalColor.transparent)
+        p = QtGui.QPainter(px)
+        p.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        p.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform)
+        path = card_path(0, 0, g)
+        p.setClipPath(path)
+        if src is not None:
+            sw, sh = src.width(), src.height()
+            s = max(g.total_w / sw, g.ch / sh)
+            dw, dh = sw * s, sh * s
+            dx = (g.total_w - dw) / 2
+            dy = (g.ch - dh) / 2
+            p.drawPixmap(QtCore.QRectF(dx, dy, dw, dh).toRect(), src)
+        else:
+            # Shimmer placeholder while loading
+            grad = QtGui.QLinearGradient(0, 0, g.total_w, 0)
+            grad.setColorAt(0.0, QtGui.QColor(30, 30, 45))
+            grad.setColorAt(0.5, QtGui.QColor(50, 50, 70))
+            grad.setColorAt(1.0, QtGui.QColor(30, 30, 45))
+            p.fillPath(path, QtGui.QBrush(grad))
+        if g.darkness:
+            # The live overlay used to be drawn under the card's opacity too
+            p.fillPath(path, QtGui.QColor(0, 0, 0, int(g.darkness * g.alpha)))
+        p.end()
+        return px
 
 
 # ── Cached fonts ──────────────────────────────────────────────────────────────
@@ -105,92 +578,1618 @@ def get_font(size: int, bold: bool = False) -> QtGui.QFont:
     return _FONT_CACHE[key]
 
 
-# ── Async thumbnail loader ────────────────────────────────────────────────────
+# ── Wallpaper index ───────────────────────────────────────────────────────────
 
 
-class ThumbLoader(QtCore.QThread):
-    """Loads thumbnails in a background thread, emitting (index, pixmap) per image."""
+class WallIndex(QtCore.QObject):
+    """Recursive, sorted wallpaper list kept in step with the tree on disk.
+
+    The manifest records every directory's mtime and the image names in
+    it. A directory's mtime moves whenever an entry is added, removed or
+    renamed in it, so on start only directories whose mtime changed are
+    listed again. While running, QFileSystemWatcher reports changed
+    directories and only those are re-listed, so one new image costs one
+    listing of its own directory rather than a walk of the whole tree.
+    changed carries just the paths added and removed, for
+    Carousel.splice().
+    """
+
+    changed = QtCore.pyqtSignal(list, list)  # added, removed
+
+    def __init__(self, root: Path, manifest: Path | None = None):
+        super().__init__()
+        self.root = root
+        self.manifest = manifest or WALL_INDEX
+        # dir -> {"mtime": float, "files": [name], "dirs": [name]}
+        self._dirs: dict[str, dict] = {}
+        self.images: list[Path] = []
+        self._added: list[Path] = []
+        self._removed: list[Path] = []
+        self._dirty_dirs: set[str] = set()
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_dir_changed)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(INDEX_SETTLE_MS)
+        self._timer.timeout.connect(self._flush)
+        self._save_timer = QtCore.QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(INDEX_SAVE_MS)
+        self._save_timer.timeout.connect(self._save)
+
+    def _key(self, p: Path | str) -> str:
+        # Plain string slicing; pathlib's relative_to() dominates big trees
+        return str(p)[len(str(self.root)) + 1 :].lower()
+
+    # ── Scanning ──────────────────────────────────────────────────────────────
+
+    @TRACE.timed
+    def refresh(self):
+        """Bring the index up to date, listing only directories that changed."""
+        self._load()
+        dirty = self._scan(str(self.root))
+        paths = [
+            os.path.join(d, name) for d, e in self._dirs.items() for name in e["files"]
+        ]
+        self.images = [Path(p) for p in sorted(paths, key=self._key)]
+        self._added, self._removed = [], []
+        if dirty:
+            self._save()
+        self._watch()
+
+    def _scan(self, d: str) -> bool:
+        try:
+            mtime = os.stat(d).st_mtime
+        except OSError:
+            return self._drop(d)
+        entry = self._dirs.get(d)
+        dirty = False
+        if entry is None or entry["mtime"] != mtime:
+            dirty = self._list(d, mtime)
+            entry = self._dirs.get(d)
+        for name in entry["dirs"] if entry else ():
+            dirty |= self._scan(os.path.join(d, name))
+        return dirty
+
+    def _list(self, d: str, mtime: float | None = None) -> bool:
+        """Re-list one directory; True if its images or subdirectories changed."""
+        try:
+            if mtime is None:
+                mtime = os.stat(d).st_mtime
+            with os.scandir(d) as it:
+                entries = [e for e in it if not e.name.startswith(".")]
+        except OSError:
+            return self._drop(d)
+        old = self._dirs.get(d) or {"files": [], "dirs": []}
+        files, dirs = set(), []
+        for e in entries:
+            try:
+                if e.is_dir(follow_symlinks=False):
+                    dirs.append(e.name)
+                elif os.path.splitext(e.name)[1].lower() in IMAGE_EXTS:
+                    files.add(e.name)
+            except OSError:
+                continue
+        gone = set(old["files"]) - files
+        added = files - set(old["files"])
+        self._dirs[d] = {"mtime": mtime, "files": sorted(files), "dirs": sorted(dirs)}
+        for name in gone:
+            self._remove(Path(d) / name)
+        for name in added:
+            self._insert(Path(d) / name)
+        dirty = bool(gone or added or set(dirs) != set(old["dirs"]))
+        for name in set(old["dirs"]) - set(dirs):
+            self._drop(os.path.join(d, name))
+        return dirty
+
+    def _drop(self, d: str) -> bool:
+        """Forget directory d and everything below it."""
+        entry = self._dirs.pop(d, None)
+        if entry is None:
+            return False
+        for name in entry["files"]:
+            self._remove(Path(d) / name)
+        for name in entry["dirs"]:
+            self._drop(os.path.join(d, name))
+        return True
+
+    def _insert(self, p: Path):
+        bisect.insort(self.images, p, key=self._key)
+        self._added.append(p)
+
+    def _remove(self, p: Path):
+        self._removed.append(p)
+        i = bisect.bisect_left(self.images, self._key(p), key=self._key)
+        if i < len(self.images) and self.images[i] == p:
+            del self.images[i]
+        elif p in self.images:  # keys equal but for case
+            self.images.remove(p)
+
+    # ── Live updates ──────────────────────────────────────────────────────────
+
+    def _watch(self):
+        watched = set(self._watcher.directories())
+        wanted = set(self._dirs)
+        if watched - wanted:
+            self._watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self._watcher.addPaths(list(wanted - watched))
+
+    def _on_dir_changed(self, d: str):
+        self._dirty_dirs.add(d)
+        self._timer.start()
+
+    def _flush(self):
+        dirty = False
+        for d in sorted(self._dirty_dirs):
+            if d not in self._dirs:
+                continue
+            dirty |= self._list(d)
+            # Subdirectories that just appeared are walked in full
+            for name in self._dirs.get(d, {"dirs": ()})["dirs"]:
+                sub = os.path.join(d, name)
+                if sub not in self._dirs:
+                    dirty |= self._scan(sub)
+        self._dirty_dirs.clear()
+        added, removed = self._added, self._removed
+        self._added, self._removed = [], []
+        if dirty:
+            self._save_timer.start()
+            self._watch()
+            self.changed.emit(added, removed)
+
+    # ── Manifest ──────────────────────────────────────────────────────────────
+
+    def _load(self):
+        try:
+            data = json.loads(self.manifest.read_text())
+        except (OSError, ValueError):
+            return
+        # Listings made under another set of extensions would miss files
+        if data.get("root") == str(self.root) and data.get("exts") == sorted(
+            IMAGE_EXTS
+        ):
+            self._dirs = data.get("dirs", {})
+
+    def _save(self):
+        tmp = self.manifest.with_name(self.manifest.name + ".tmp")
+        try:
+            self.manifest.parent.mkdir(parents=True, exist_ok=True)
+            data = {"root": str(self.root), "exts": sorted(IMAGE_EXTS)}
+            data["dirs"] = self._dirs
+            tmp.write_text(json.dumps(data))
+            os.replace(tmp, self.manifest)
+        except OSError:
+            pass
+
+
+# ── Thumbnail cache ───────────────────────────────────────────────────────────
+
+
+class ThumbCache:
+    """Persistent card-sized thumbnails stored in one memory-mapped pack file.
+
+    The pack holds raw THUMB_FMT pixels back to back after a short header; a
+    JSON index maps each path to (mtime_ns, size, offset), so a warm launch is
+    a memcpy, not a decode. Stale entries are dropped on lookup and reclaimed
+    by compact(). Only one picker may write at a time — a second instance
+    runs uncached.
+    """
+
+    VERSION = 1
+    MAGIC = b"WALLPACK"
+
+    @TRACE.timed
+    def __init__(
+        self, w: int, h: int, pack: Path = THUMB_PACK, index: Path = THUMB_INDEX
+    ):
+        self.w, self.h = w, h
+        self.stride = w * 4
+        self.nbytes = self.stride * h
+        self._pack = pack
+        self._index = index
+        self._entries: dict[str, list[int]] = {}
+        self._token = ""
+        self._dirty = False
+        self._mm: mmap.mmap | None = None
+        self._out = None
+        self._lockf = None
+        self.enabled = False
+        try:
+            pack.parent.mkdir(parents=True, exist_ok=True)
+            self._lockf = open(pack.with_suffix(".lock"), "w")
+            fcntl.flock(self._lockf, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return
+        try:
+            self._load()
+        except OSError:
+            return
+        self.enabled = True
+
+    def _load(self):
+        try:
+            meta = json.loads(self._index.read_text())
+        except (OSError, ValueError):
+            meta = {}
+        try:
+            with open(self._pack, "rb") as f:
+                header = f.read(16)
+                total = os.fstat(f.fileno()).st_size
+        except OSError:
+            header, total = b"", 0
+        # Index and pack share a random token, so a crash mid-compaction can
+        # never pair an index with the wrong pack — it is discarded instead.
+        if header[:8] == self.MAGIC:
+            self._token = header[8:].hex()
+        if (
+            self._token
+            and meta.get("version") == self.VERSION
+            and meta.get("size") == [self.w, self.h]
+            and meta.get("pack") == self._token
+        ):
+            self._entries = {
+                k: e
+                for k, e in meta.get("entries", {}).items()
+                if e[2] + self.nbytes <= total
+            }
+        if not self._entries:
+            self._token = self._new_pack(self._pack)
+            self._dirty = True
+        self._map()
+
+    def _new_pack(self, path: Path):
+        token = os.urandom(8)
+        with open(path, "wb") as f:
+            f.write(self.MAGIC + token)
+        return token.hex()
+
+    def _map(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        with open(self._pack, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(self, path: Path) -> QtGui.QImage | None:
+        if not self.enabled:
+            return None
+        key = str(path)
+        e = self._entries.get(key)
+        if e is None:
+            return None
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        if e[0] != st.st_mtime_ns or e[1] != st.st_size:
+            del self._entries[key]
+            self._dirty = True
+            return None
+        off = e[2]
+        if off + self.nbytes > len(self._mm):
+            return None
+        data = self._mm[off : off + self.nbytes]
+        return QtGui.QImage(data, self.w, self.h, self.stride, THUMB_FMT).copy()
+
+    def put(self, path: Path, img: QtGui.QImage):
+        if not self.enabled or img.width() != self.w or img.height() != self.h:
+            return
+        try:
+            st = path.stat()
+            if self._out is None:
+                self._out = open(self._pack, "ab")
+            img = img.convertToFormat(THUMB_FMT)
+            off = self._out.seek(0, os.SEEK_END)
+            self._out.write(img.constBits().asstring(self.nbytes))
+        except OSError:
+            return
+        self._entries[str(path)] = [st.st_mtime_ns, st.st_size, off]
+        self._dirty = True
+
+    def flush(self):
+        """Write the index atomically if anything changed."""
+        if not self.enabled:
+            return
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+        if not self._dirty:
+            return
+        try:
+            self._write_index(self._entries, self._token)
+            self._dirty = False
+        except OSError:
+            pass
+
+    def _write_index(self, entries: dict, token: str):
+        meta = {
+            "version": self.VERSION,
+            "size": [self.w, self.h],
+            "pack": token,
+            "entries": entries,
+        }
+        tmp = self._index.with_name(self._index.name + ".tmp")
+        tmp.write_text(json.dumps(meta, separators=(",", ":")))
+        os.replace(tmp, self._index)
+
+    def compact(self, cancelled=lambda: False):
+        """Rewrite the pack without stale or deleted entries once enough of it is dead."""
+        if not self.enabled:
+            return
+        self.flush()
+        live = {k: e for k, e in self._entries.items() if os.path.exists(k)}
+        try:
+            total = self._pack.stat().st_size
+        except OSError:
+            return
+        dead = total - 16 - len(live) * self.nbytes
+        if dead <= max(self.nbytes * 4, total * COMPACT_RATIO):
+            return
+
+        tmp = self._pack.with_name(self._pack.name + ".tmp")
+        entries = {}
+        try:
+            token = self._new_pack(tmp)
+            with open(self._pack, "rb") as src, open(tmp, "ab") as out:
+                out.seek(0, os.SEEK_END)
+                for key, (mtime, size, off) in live.items():
+                    if cancelled():
+                        raise InterruptedError
+                    src.seek(off)
+                    entries[key] = [mtime, size, out.tell()]
+                    out.write(src.read(self.nbytes))
+            self._write_index(entries, token)
+            os.replace(tmp, self._pack)
+        except (OSError, InterruptedError):
+            tmp.unlink(missing_ok=True)
+            return
+        self._entries = entries
+        self._token = token
+        self._map()
+
+    def close(self):
+        self.flush()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._lockf is not None:
+            self._lockf.close()
+            self._lockf = None
+
+
+# ── Thumbnail store ───────────────────────────────────────────────────────────
+
+
+def splice_map(gone: list[int], added: list[int]):
+    """Old index → new, once gone are deleted and added inserted; None if deleted.
+
+    Both lists are sorted; gone holds old indices, added final ones.
+    """
+    dropped = set(gone)
+    first = min(gone[:1] + added[:1], default=0)
+
+    def renumber(i: int) -> int | None:
+        if i < first:
+            return i
+        if i in dropped:
+            return None
+        i -= bisect.bisect_left(gone, i)
+        for j in added:
+            if j > i:
+                break
+            i += 1
+        return i
+
+    return renumber
+
+
+class ThumbStore:
+    """Byte-budgeted thumbnails: a hot tier of pixmaps, a cold tier of JPEG bytes.
+
+    Victims are picked farthest-from-centre first, least recently used on a
+    tie; the cards actually drawn are never demoted. Dropped entries are
+    remembered so the carousel can ask the loader for them again. Entries
+    whose image leaves the list are parked by path, in whichever tier they
+    were in, and come back if it is listed again; they go first when the
+    budget runs out.
+    """
+
+    def __init__(self, n: int, budget_mb: int | None = None):
+        self.n = n
+        self.budget = (budget_mb or THUMB_BUDGET_MB) << 20
+        self.centre = 0
+        self._hot: OrderedDict[int, QtGui.QPixmap] = OrderedDict()
+        self._cold: OrderedDict[int, bytes] = OrderedDict()
+        self._gone: set[int] = set()
+        self._parked: OrderedDict[str, QtGui.QPixmap | bytes] = OrderedDict()
+        self.hot_bytes = 0
+        self.cold_bytes = 0
+        self.parked_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, i: int) -> bool:
+        return i in self._hot or i in self._cold
+
+    def __len__(self) -> int:
+        return len(self._hot) + len(self._cold)
+
+    def _dist(self, i: int) -> int:
+        d = abs(i - self.centre) % self.n if self.n else 0
+        return min(d, self.n - d)
+
+    @staticmethod
+    def _size(px: QtGui.QPixmap) -> int:
+        return px.width() * px.height() * px.depth() // 8
+
+    @classmethod
+    def _bytes(cls, entry: QtGui.QPixmap | bytes) -> int:
+        return len(entry) if isinstance(entry, bytes) else cls._size(entry)
+
+    def get(self, i: int) -> QtGui.QPixmap | None:
+        px = self._hot.get(i)
+        if px is not None:
+            self._hot.move_to_end(i)
+            self.hits += 1
+            return px
+        data = self._cold.pop(i, None)
+        if data is None:
+            self.misses += 1
+            return None
+        self.cold_bytes -= len(data)
+        self.hits += 1
+        px = QtGui.QPixmap()
+        px.loadFromData(data, "JPG")
+        self._insert(i, px)
+        return px
+
+    def put(self, i: int, img: QtGui.QImage):
+        self.discard(i)
+        self._gone.discard(i)
+        self._insert(i, QtGui.QPixmap.fromImage(img))
+
+    def discard(self, i: int):
+        px = self._hot.pop(i, None)
+        if px is not None:
+            self.hot_bytes -= self._size(px)
+        data = self._cold.pop(i, None)
+        if data is not None:
+            self.cold_bytes -= len(data)
+
+    def remap(
+        self, moved: dict[int, int], n: int, old: list, new: dict[str, int]
+    ) -> list[int]:
+        """Renumber entries after the image list changed; the indices restored.
+
+        old is the previous list and new maps paths to their new index.
+        Entries that are not moved are parked, and parked ones that are
+        listed again are restored.
+        """
+        hot: OrderedDict[int, QtGui.QPixmap] = OrderedDict()
+        for i, px in self._hot.items():
+            if i in moved:
+                hot[moved[i]] = px
+            else:
+                self.hot_bytes -= self._size(px)
+                self._park(str(old[i]), px)
+        cold: OrderedDict[int, bytes] = OrderedDict()
+        for i, data in self._cold.items():
+            if i in moved:
+                cold[moved[i]] = data
+            else:
+                self.cold_bytes -= len(data)
+                self._park(str(old[i]), data)
+        restored = []
+        for key in [k for k in self._parked if k in new]:
+            entry = self._parked.pop(key)
+            self.parked_bytes -= self._bytes(entry)
+            i = new[key]
+            if i in hot or i in cold:
+                continue
+            if isinstance(entry, bytes):
+                cold[i] = entry
+                self.cold_bytes += len(entry)
+            else:
+                hot[i] = entry
+                self.hot_bytes += self._size(entry)
+            restored.append(i)
+        self._hot, self._cold = hot, cold
+        self._gone = {moved[i] for i in self._gone if i in moved}
+        self.n = n
+        self.centre = moved.get(self.centre, 0)
+        self._evict()
+        return restored
+
+    def _park(self, key: str, entry: QtGui.QPixmap | bytes):
+        old = self._parked.pop(key, None)
+        if old is not None:
+            self.parked_bytes -= self._bytes(old)
+        self._parked[key] = entry
+        self.parked_bytes += self._bytes(entry)
+
+    def indices(self) -> set[int]:
+        """Every index remap() has to renumber: thumbnails, reloads, the centre."""
+        return self._hot.keys() | self._cold.keys() | self._gone | {self.centre}
+
+    def take_gone(self, i: int) -> bool:
+        """True once for an entry that was evicted outright and needs reloading."""
+        if i in self._gone:
+            self._gone.remove(i)
+            return True
+        return False
+
+    def set_centre(self, i: int):
+        self.centre = i
+        self._evict()
+
+    def stats(self) -> dict:
+        return {
+            "hot": len(self._hot),
+            "cold": len(self._cold),
+            "hot_bytes": self.hot_bytes,
+            "cold_bytes": self.cold_bytes,
+            "parked": len(self._parked),
+            "parked_bytes": self.parked_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _insert(self, i: int, px: QtGui.QPixmap):
+        self._hot[i] = px
+        self.hot_bytes += self._size(px)
+        self._evict()
+
+    def _victim(self, tier: OrderedDict) -> int | None:
+        # OrderedDict iterates oldest first, so max() keeps the LRU on ties
+        i = max(tier, key=self._dist, default=None)
+        if i is None or self._dist(i) <= VISIBLE:
+            return None
+        return i
+
+    def _evict(self):
+        while self._parked and (
+            self.hot_bytes + self.cold_bytes + self.parked_bytes > self.budget
+        ):
+            self.parked_bytes -= self._bytes(self._parked.popitem(last=False)[1])
+        while self.hot_bytes > self.budget * HOT_SHARE:
+            i = self._victim(self._hot)
+            if i is None:
+                break
+            px = self._hot.pop(i)
+            self.hot_bytes -= self._size(px)
+            buf = QtCore.QBuffer()
+            buf.open(QtCore.QIODevice.OpenModeFlag.WriteOnly)
+            px.save(buf, "JPG", 85)
+            data = bytes(buf.data())
+            self._cold[i] = data
+            self.cold_bytes += len(data)
+        while self._cold and self.hot_bytes + self.cold_bytes > self.budget:
+            i = max(self._cold, key=self._dist)
+            self.cold_bytes -= len(self._cold.pop(i))
+            self._gone.add(i)
+
+
+# ── Decode pool ───────────────────────────────────────────────────────────────
+
+_SLAB: shared_memory.SharedMemory | None = None
+
+
+def _decode_init(name: str):
+    global _SLAB
+    _SLAB = shared_memory.SharedMemory(name=name)
+
+
+def _decode_job(slot: int, path: str, w: int, h: int) -> int:
+    img = card_image(Path(path), w, h).convertToFormat(THUMB_FMT)
+    n = w * h * 4
+    _SLAB.buf[slot * n : (slot + 1) * n] = img.constBits().asstring(n)
+    return slot
+
+
+class DecodePool:
+    """Crops thumbnails in worker processes, away from the GIL.
+
+    Workers write pixels into fixed slots of one shared-memory slab instead
+    of pickling them back; the caller only copies a finished slot into a
+    QImage. Twice as many slots as workers keeps every core fed, and the
+    jobs still queued behind them can be cancelled.
+    """
+
+    def __init__(self, w: int, h: int, workers: int | None = None):
+        workers = workers or DECODE_WORKERS
+        self.w, self.h = w, h
+        self.nbytes = w * h * 4
+        self._free = list(range(workers * 2))
+        self._running: dict[Future, tuple[int, int]] = {}
+        self._slab = shared_memory.SharedMemory(
+            create=True, size=self.nbytes * len(self._free)
+        )
+        self._pool = ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_decode_init,
+            initargs=(self._slab.name,),
+        )
+
+    @property
+    def idle_slots(self) -> int:
+        return len(self._free)
+
+    def busy(self) -> bool:
+        return bool(self._running)
+
+    def submit(self, key: Path, path: Path):
+        slot = self._free.pop()
+        try:
+            fut = self._pool.submit(_decode_job, slot, str(path), self.w, self.h)
+        except RuntimeError:
+            self._free.append(slot)
+            raise
+        self._running[fut] = (key, slot)
+
+    def cancel(self, keep) -> list[Path]:
+        """Cancel jobs not yet started whose key fails keep(key); returns their keys."""
+        cancelled = []
+        for fut, (key, slot) in list(self._running.items()):
+            if not keep(key) and fut.cancel():
+                del self._running[fut]
+                self._free.append(slot)
+                cancelled.append(key)
+        return cancelled
+
+    def collect(self, timeout: float | None = None):
+        """Yield (key, QImage) for finished jobs; None where the worker failed."""
+        done, _ = wait(self._running, timeout, return_when=FIRST_COMPLETED)
+        for fut in done:
+            key, slot = self._running.pop(fut)
+            self._free.append(slot)
+            img = None
+            if fut.exception() is None:
+                off = slot * self.nbytes
+                data = bytes(self._slab.buf[off : off + self.nbytes])
+                img = QtGui.QImage(data, self.w, self.h, self.w * 4, THUMB_FMT).copy()
+            yield key, img
+
+    def drain(self) -> list[Path]:
+        """Forget every outstanding job, returning their keys."""
+        keys = [key for key, _ in self._running.values()]
+        for fut in self._running:
+            fut.cancel()
+        self._running.clear()
+        return keys
+
+    def close(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._slab.close()
+        self._slab.unlink()
+
+
+# ── Async thumbnail loader ────────────────────────────────────────────────────
 
-    loaded = QtCore.pyqtSignal(int, QtGui.QPixmap)
 
-    def __init__(self, images: list[Path], centre: int = 0):
+class ThumbLoader(QtCore.QThread):
+    """Loads thumbnails in a background thread, emitting (path, image) per image.
+
+    Pending work is ranked outward from the carousel's current index and
+    re-ranked on every move, two cards ahead in the direction of travel for
+    each one behind. Cache hits are emitted straight away; misses go to a
+    DecodePool when there are cores to spare, otherwise are decoded here one
+    at a time; either way a fresh freedesktop thumbnail stands in for the
+    original when it is large enough. Queued decodes that drift past
+    CANCEL_RADIUS are cancelled and returned to the pending set rather than
+    finished. Work in flight is keyed by path, so set_images() can swap the
+    list underneath it. Every thumbnail also feeds the colour-similarity
+    index when NumPy is present.
+    """
+
+    loaded = QtCore.pyqtSignal(str, QtGui.QImage)
+
+    def __init__(self, images: list[Path], centre: int = 0, dpr: float = 1.0):
         super().__init__()
         self.images = images
+        self._index = {p: i for i, p in enumerate(images)}
         self._centre = centre
+        self._direction = 0
+        self._moved = True
         self._stop = False
+        self._pending = set(range(len(images)))
+        self._cond = threading.Condition()
+        self.colours = None  # colours.ColourIndex, once run() has loaded it
+        # Thumbnails are decoded in device pixels so HiDPI cards stay sharp
+        self.w = round(THUMB_W * dpr)
+        self.h = round(THUMB_H * dpr)
+
+    def set_centre(self, i: int, direction: int = 0):
+        """Re-rank pending work around index i; direction is -1, 0 or +1."""
+        with self._cond:
+            self._centre = i
+            self._direction = direction
+            self._moved = True
+            self._cond.notify()
+
+    def set_images(self, images: list[Path], centre: int, loaded=()):
+        """Switch to a new list; paths already loaded or in flight are not redone.
+
+        loaded names paths the caller holds thumbnails for from elsewhere.
+        """
+        with self._cond:
+            waiting = {self.images[i] for i in self._pending}
+            done = (self._index.keys() - waiting).union(loaded)
+            self.images = images
+            self._index = {p: i for i, p in enumerate(images)}
+            self._pending = {i for i, p in enumerate(images) if p not in done}
+            self._centre = centre
+            self._direction = 0
+            self._moved = True
+            self._cond.notify()
+
+    def narrow(self, images: list[Path], keep: list[int], centre: int):
+        """Switch to a sublist of the current list; keep[i] is images[i]'s old index.
+
+        Only the kept entries are renumbered, so a filter that narrows costs
+        its matches rather than the whole list.
+        """
+        with self._cond:
+            pending = self._pending
+            self._pending = {i for i, old in enumerate(keep) if old in pending}
+            self.images = images
+            self._index = dict(zip(images, range(len(images))))
+            self._centre = centre
+            self._direction = 0
+            self._moved = True
+            self._cond.notify()
+
+    def splice(
+        self,
+        images: list[Path],
+        renumber,
+        lo: int,
+        removed: list[Path],
+        added: list[int],
+    ):
+        """Follow Carousel.splice(): renumber pending work and queue added.
+
+        Indices below lo are unchanged; renumber maps the others (None for
+        a removed one).
+        """
+        with self._cond:
+            for p in removed:
+                self._index.pop(p, None)
+            self._index.update(zip(images[lo:], range(lo, len(images))))
+            pending = (renumber(i) for i in self._pending)
+            self._pending = {i for i in pending if i is not None}.union(added)
+            self.images = images
+            self._moved = True
+            self._cond.notify()
+
+    def request(self, i: int):
+        """Load index i again, e.g. after ThumbStore evicted it outright."""
+        with self._cond:
+            self._pending.add(i)
+            self._moved = True
+            self._cond.notify()
 
     def stop(self):
-        self._stop = True
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
         self.wait()
 
-    def run(self):
+    def _near(self, path: Path) -> bool:
+        i = self._index.get(path)
+        if i is None:
+            return False
         n = len(self.images)
-        # Load outward from the starting centre index
-        order = sorted(range(n), key=lambda i: abs(i - self._centre))
-        max_w = int(CARD_W * CENTER_SCALE) + int(CARD_W * CENTER_SCALE * SKEW) + 10
-        max_h = int(CARD_H * CENTER_SCALE) + 10
-        for i in order:
-            if self._stop:
-                return
-            px = scaled_crop(self.images[i], max_w, max_h)
-            self.loaded.emit(i, px)
+        d = abs(i - self._centre) % n
+        return min(d, n - d) <= CANCEL_RADIUS
+
+    def _requeue(self, paths):
+        # Paths dropped from the list by set_images() are simply forgotten
+        for path in paths:
+            i = self._index.get(path)
+            if i is not None:
+                self._pending.add(i)
+
+    def _ranked(self, centre: int, direction: int):
+        n = len(self.images)
+        half = n // 2 + 1
+        step = direction or 1
+        ahead = behind = 1
+        yield centre % n
+        while ahead <= half or behind <= half:
+            for _ in range(2 if direction else 1):
+                if ahead <= half:
+                    yield (centre + step * ahead) % n
+                    ahead += 1
+            if behind <= half:
+                yield (centre - step * behind) % n
+                behind += 1
+
+    def run(self):
+        try:
+            # Imported here so decode workers, which re-import this module,
+            # never load NumPy
+            import colours
+
+            self.colours = colours.ColourIndex()
+        except ImportError:
+            pass
+        cache = ThumbCache(self.w, self.h)
+        pool: DecodePool | None = None
+        ranked = iter(())
+        backlog: deque[Path] = deque()  # misses waiting for a free slot
+        pooled = DECODE_WORKERS > 1
+        compacted = False
+        try:
+            while True:
+                with self._cond:
+                    while not (
+                        self._stop
+                        or self._pending
+                        or backlog
+                        or (pool and pool.busy())
+                        or not compacted
+                    ):
+                        self._cond.wait()
+                    if self._stop:
+                        return
+                    if self._moved:
+                        self._moved = False
+                        ranked = self._ranked(self._centre, self._direction)
+                        self._requeue(backlog)
+                        backlog.clear()
+                        if pool:
+                            self._requeue(pool.cancel(self._near))
+                    batch = []
+                    if not backlog:
+                        for i in ranked:
+                            if i in self._pending:
+                                self._pending.remove(i)
+                                batch.append(self.images[i])
+                                if len(batch) == 8:
+                                    break
+                        else:
+                            self._moved = bool(self._pending)
+
+                if not (batch or backlog or (pool and pool.busy())):
+                    # Everything is loaded — reclaim stale pack space while idle
+                    if self.colours is not None:
+                        self.colours.save()
+                    if not compacted:
+                        cache.compact(cancelled=lambda: self._stop)
+                        compacted = True
+                    continue
+
+                for path in batch:
+                    img = cache.get(path)
+                    if img is None:
+                        backlog.append(path)
+                    else:
+                        self._emit(path, img)
+
+                if pool is None and backlog and pooled:
+                    try:
+                        pool = DecodePool(self.w, self.h)
+                    except OSError:
+                        pooled = False
+                if pool is None:
+                    if backlog:
+                        path = backlog.popleft()
+                        self._done(path, card_image(path, self.w, self.h), cache)
+                    continue
+                try:
+                    while backlog and pool.idle_slots:
+                        pool.submit(backlog[0], backlog[0])
+                        backlog.popleft()
+                    if pool.busy():
+                        for path, img in pool.collect(timeout=0 if batch else 0.05):
+                            if img is None:
+                                img = card_image(path, self.w, self.h)
+                            self._done(path, img, cache)
+                except RuntimeError:
+                    # Broken pool — finish everything in this thread instead
+                    backlog.extendleft(reversed(pool.drain()))
+                    pool.close()
+                    pool = None
+                    pooled = False
+        finally:
+            if pool is not None:
+                pool.close()
+            cache.close()
+            if self.colours is not None:
+                self.colours.save()
+
+    def _done(self, path: Path, img: QtGui.QImage, cache: ThumbCache):
+        cache.put(path, img)
+        self._emit(path, img)
+
+    def _emit(self, path: Path, img: QtGui.QImage):
+        if self.colours is not None and path not in self.colours:
+            self.colours.add(path, img)
+        self.loaded.emit(str(path), img)
 
 
 # ── Background loader ─────────────────────────────────────────────────────────
 
 
 class BgLoader(QtCore.QThread):
-    """Loads and scales a single background image without blocking the main thread."""
+    """Decodes window-sized backgrounds one at a time, emitting (path, image).
+
+    Each request() replaces everything still queued, so fast scrolling never
+    stacks up decodes — at most the one already in progress finishes.
+    """
+
+    ready = QtCore.pyqtSignal(str, QtGui.QImage)
+
+    def __init__(self, dpr: float = 1.0):
+        super().__init__()
+        self._dpr = dpr
+        self._queue: list[Path] = []
+        self._stop = False
+        self._cond = threading.Condition()
+
+    def request(self, paths: list[Path]):
+        with self._cond:
+            self._queue = list(paths)
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self.wait()
+
+    def run(self):
+        w, h = round(WIN_W * self._dpr), round(WIN_H * self._dpr)
+        while True:
+            with self._cond:
+                while not (self._queue or self._stop):
+                    self._cond.wait()
+                if self._stop:
+                    return
+                path = self._queue.pop(0)
+            img = crop_image(path, w, h)
+            if self._stop:
+                return
+            self.ready.emit(str(path), img)
+
+
+# ── Animation ─────────────────────────────────────────────────────────────────
+
+
+def is_animated(path: Path) -> bool:
+    if path.suffix.lower() not in ANIM_EXTS:
+        return False
+    reader = QtGui.QImageReader(str(path))
+    return reader.supportsAnimation() and reader.imageCount() != 1
+
+
+class FrameRing(QtCore.QThread):
+    """Decodes one animated wallpaper's frames, a few ahead of the one shown.
+
+    Frames are read one at a time at thumbnail size, cover-cropped like the
+    thumbnails, into a ring of ANIM_FRAMES (image, delay_ms) pairs. The
+    thread waits whenever the ring is full, so it decodes no faster than
+    the frames are shown, and play(None) empties the ring and idles it.
+    """
+
+    def __init__(self, w: int, h: int):
+        super().__init__()
+        self.w, self.h = w, h
+        self._path: Path | None = None
+        self._frames: deque[tuple[QtGui.QImage, int]] = deque()
+        self._generation = 0  # bumped by play(), so stale frames are dropped
+        self._stop = False
+        self._cond = threading.Condition()
+
+    def play(self, path: Path | None):
+        with self._cond:
+            self._path = path
+            self._frames.clear()
+            self._generation += 1
+            self._cond.notify()
+
+    def playing(self) -> bool:
+        with self._cond:
+            return self._path is not None
+
+    def take(self) -> tuple[QtGui.QImage, int] | None:
+        """The next frame and how long to show it, or None if none is ready."""
+        with self._cond:
+            if not self._frames:
+                return None
+            frame = self._frames.popleft()
+            self._cond.notify()
+            return frame
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self.wait()
+
+    def _open(self, path: Path) -> QtGui.QImageReader:
+        reader = QtGui.QImageReader(str(path))
+        reader.setAllocationLimit(DECODE_LIMIT_MB)
+        size = reader.size()
+        if size.isValid():
+            sw, sh = size.width(), size.height()
+            scale = max(self.w / sw, self.h / sh)
+            if scale < 1.0:
+                reader.setScaledSize(
+                    QtCore.QSize(math.ceil(sw * scale), math.ceil(sh * scale))
+                )
+        return reader
+
+    def run(self):
+        generation = -1
+        reader = None
+        read = 0  # frames read since reader was opened
+        while True:
+            with self._cond:
+                while not (
+                    self._stop
+                    or (self._path is not None and len(self._frames) < ANIM_FRAMES)
+                ):
+                    self._cond.wait()
+                if self._stop:
+                    return
+                if generation != self._generation:
+                    generation = self._generation
+                    reader = None
+                path = self._path
+            if reader is None:
+                reader, read = self._open(path), 0
+            img = reader.read()
+            if img.isNull():
+                reader = None  # past the last frame: loop from the first
+                if read == 0:
+                    with self._cond:
+                        if generation == self._generation:
+                            self._path = None  # unreadable; give up
+                continue
+            read += 1
+            delay = reader.nextImageDelay()
+            frame = cover_crop(img, self.w, self.h).convertToFormat(THUMB_FMT)
+            with self._cond:
+                if generation == self._generation:
+                    self._frames.append((frame, delay))
+
 
-    ready = QtCore.pyqtSignal(QtGui.QPixmap)
+# ── Output variants ───────────────────────────────────────────────────────────
 
-    def __init__(self, path: Path):
+
+def outputs() -> list[tuple[str, int, int]]:
+    """(name, width, height) of every connected screen, in device pixels."""
+    found = []
+    for screen in QtGui.QGuiApplication.screens():
+        g, dpr = screen.geometry(), screen.devicePixelRatio()
+        found.append((screen.name(), round(g.width() * dpr), round(g.height() * dpr)))
+    return found
+
+
+def variant_stem(path: Path, w: int, h: int) -> Path | None:
+    """Variant of path for a w×h screen, less its extension; None if path is gone."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = f"{path}\0{st.st_mtime_ns}\0{st.st_size}".encode()
+    return VARIANT_DIR / f"{hashlib.blake2b(key, digest_size=12).hexdigest()}-{w}x{h}"
+
+
+def find_variant(path: Path, w: int, h: int) -> Path | None:
+    stem = variant_stem(path, w, h)
+    if stem is None:
+        return None
+    for ext in (".jpg", ".png"):
+        f = stem.with_suffix(ext)
+        if f.exists():
+            return f
+    return None
+
+
+def is_lossless(path: Path) -> bool:
+    """Whether path stores its pixels exactly: anything but JPEG and lossy WebP."""
+    ext = path.suffix.lower()
+    if ext in (".jpg", ".jpeg"):
+        return False
+    if ext != ".webp":
+        return True
+    # RIFF chunks: the bitstream is VP8L when lossless, "VP8 " when not; an
+    # extended file (VP8X) puts others, like ALPH, ahead of it
+    try:
+        with open(path, "rb") as f:
+            head = f.read(12)
+            if head[:4] != b"RIFF" or head[8:] != b"WEBP":
+                return False
+            while len(chunk := f.read(8)) == 8:
+                kind, size = chunk[:4], int.from_bytes(chunk[4:], "little")
+                if kind in (b"VP8L", b"VP8 "):
+                    return kind == b"VP8L"
+                f.seek(size + (size & 1), os.SEEK_CUR)
+    except OSError:
+        pass
+    return False
+
+
+def variants(path: Path, screens: list[tuple[str, int, int]]) -> dict[str, str]:
+    """Output name → variant file, only when every screen has one ready."""
+    found = {}
+    for name, w, h in screens:
+        f = find_variant(path, w, h)
+        if f is None or not name:
+            return {}
+        os.utime(f)  # recently used, so pruned last
+        found[name] = str(f)
+    return found
+
+
+class VariantMaker(QtCore.QThread):
+    """Writes a cover-cropped copy of a wallpaper for each screen size.
+
+    Like BgLoader, each request() replaces whatever is still queued, so
+    only the card the carousel rests on gets its variants made. Lossless
+    sources, and any with alpha, stay lossless.
+    """
+
+    def __init__(self):
         super().__init__()
-        self._path = path
+        self._queue: list[tuple[Path, list]] = []
+        self._stop = False
+        self._cond = threading.Condition()
+
+    def request(self, path: Path, screens: list[tuple[str, int, int]]):
+        with self._cond:
+            self._queue = [(path, screens)]
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self.wait()
 
     def run(self):
-        px = scaled_crop(self._path, WIN_W, WIN_H)
-        self.ready.emit(px)
+        while True:
+            with self._cond:
+                while not (self._queue or self._stop):
+                    self._cond.wait()
+                if self._stop:
+                    return
+                path, screens = self._queue.pop(0)
+            made = False
+            for w, h in dict.fromkeys((w, h) for _, w, h in screens):
+                if self._stop:
+                    return
+                if find_variant(path, w, h) is None:
+                    made |= self._make(path, w, h)
+            if made:
+                self._prune()
+
+    @staticmethod
+    def _make(path: Path, w: int, h: int) -> bool:
+        stem = variant_stem(path, w, h)
+        img = read_scaled(path, w, h)
+        if stem is None or img.isNull():
+            return False
+        img = cover_crop(img, w, h)
+        exact = img.hasAlphaChannel() or is_lossless(path)
+        dest = stem.with_suffix(".png" if exact else ".jpg")
+        tmp = dest.with_name(f".{dest.name}.tmp")
+        try:
+            VARIANT_DIR.mkdir(parents=True, exist_ok=True)
+            ok = img.save(
+                str(tmp), "PNG" if exact else "JPEG", -1 if exact else VARIANT_QUALITY
+            )
+            if ok:
+                os.replace(tmp, dest)
+            return ok
+        except OSError:
+            return False
+
+    @staticmethod
+    def _prune():
+        try:
+            entries = [
+                (e.stat().st_mtime, e.stat().st_size, e.path)
+                for e in os.scandir(VARIANT_DIR)
+            ]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, f in sorted(entries):
+            if total <= VARIANT_BUDGET_MB << 20:
+                break
+            try:
+                os.unlink(f)
+            except OSError:
+                pass
+            total -= size
+
+
+# ── Apply ─────────────────────────────────────────────────────────────────────
+
+
+def set_wallpaper(path: Path, env: dict[str, str], found: dict[str, str]):
+    """Hand path to setwall.sh, or straight to the first backend installed."""
+    if SETWALL.exists():
+        subprocess.Popen(
+            ["bash", str(SETWALL), str(path)], env=env, start_new_session=True
+        )
+        return
+    # One command per output when the variants are there; feh only
+    # places files by screen order, so it gets one on a single screen
+    fade = ["--transition-type", "fade"]
+    single = list(found.values()) if len(found) == 1 else [str(path)]
+    for cmds in (
+        [["awww", "img", "-o", out, f, *fade] for out, f in found.items()]
+        or [["awww", "img", str(path), *fade]],
+        [["swww", "img", "-o", out, f] for out, f in found.items()]
+        or [["swww", "img", str(path)]],
+        [["feh", "--bg-fill", *single]],
+    ):
+        try:
+            for cmd in cmds:
+                subprocess.Popen(cmd, stderr=subprocess.DEVNULL, start_new_session=True)
+            return
+        except FileNotFoundError:
+            continue
+
+
+class ApplyJob(QtCore.QThread):
+    """Quantises one wallpaper's colours, then sets it, off the event loop.
+
+    A palette miss hashes the whole file, decodes it and runs k-means,
+    which takes a large wallpaper well past a frame; the carousel gets
+    out of the way at once and setwall.sh starts when the colours are in.
+    Emits done(True) once they are written, done(False) when setwall.sh
+    is left to run wal -i.
+    """
+
+    done = QtCore.pyqtSignal(bool)
+
+    def __init__(self, path: Path, found: dict[str, str]):
+        super().__init__()
+        self.path = path
+        self.found = found
+        self.ready = False
+
+    def run(self):
+        env = dict(os.environ)
+        try:
+            # Imported here rather than at the top: decode workers re-import
+            # this module and would each carry NumPy for nothing
+            import palette
+
+            # Instant if this image was quantised before; setwall.sh then
+            # only has to render the pywal templates
+            palette.apply(self.path)
+            env["PALETTE_READY"] = "1"
+            self.ready = True
+        except (ImportError, OSError, ValueError):
+            # No NumPy/Pillow, or an image palette.py cannot read —
+            # setwall.sh/apply.py fall back to wal -i
+            pass
+        # Screen-sized copies, if they are ready, spare the backend a resample
+        if self.found:
+            env["WALL_VARIANTS"] = json.dumps(self.found)
+        set_wallpaper(self.path, env, self.found)
+        self.done.emit(self.ready)
+
+
+# ── Snapshot ──────────────────────────────────────────────────────────────────
+
+
+def snapshot_key(images: list[Path], centre: Path, dpr: float, theme: tuple) -> str:
+    """What a frame depends on: the list, its centre card, the window and theme."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update("\0".join(map(str, images)).encode(errors="surrogateescape"))
+    h.update(f"\0{centre}\0{WIN_W}x{WIN_H}@{dpr}\0{theme}\0{RENDERER}".encode())
+    return h.hexdigest()
+
+
+@TRACE.timed
+def load_snapshot(key: str) -> QtGui.QImage | None:
+    """The saved frame if it was taken under key, else None.
+
+    The file is a JSON header line followed by raw THUMB_FMT pixels, so
+    loading it is a read and a copy, with no decode.
+    """
+    try:
+        with open(SNAPSHOT, "rb") as f:
+            meta = json.loads(f.readline())
+            if meta.get("key") != key:
+                return None
+            w, h = meta["w"], meta["h"]
+            data = f.read()
+    except (OSError, ValueError, KeyError):
+        return None
+    if len(data) != w * h * 4:
+        return None
+    img = QtGui.QImage(data, w, h, w * 4, THUMB_FMT).copy()
+    img.setDevicePixelRatio(meta.get("dpr", 1.0))
+    return img
+
+
+def save_snapshot(key: str, img: QtGui.QImage):
+    img = img.convertToFormat(THUMB_FMT)
+    meta = {"key": key, "w": img.width(), "h": img.height()}
+    meta["dpr"] = img.devicePixelRatio()
+    tmp = SNAPSHOT.with_name(SNAPSHOT.name + ".tmp")
+    try:
+        SNAPSHOT.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(meta).encode() + b"\n")
+            f.write(img.constBits().asstring(img.sizeInBytes()))
+        os.replace(tmp, SNAPSHOT)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+# ── Search ────────────────────────────────────────────────────────────────────
+
+
+class NameIndex:
+    """Wallpapers' lower-cased paths below the folder they share, searchable.
+
+    Every term of a query must appear somewhere in that path, so typing a
+    subfolder name finds the images filed under it. The paths are kept as
+    one newline-joined text, built by prepare() or else on the first search
+    after the list changes, which a fresh term is found in by a single regex
+    scan. A query that extends the previous one only re-checks that one's
+    matches.
+    """
+
+    def __init__(self):
+        self._order: list[Path] = []
+        self._keys: list[str] | None = None
+        self._text = ""
+        self._starts: list[int] = []  # offset of each key in _text
+        self._last: tuple[str, set[int]] | None = None
+
+    def set_order(self, paths: list[Path]):
+        self._order = paths
+        self._keys = None
+        self._last = None
+
+    def prepare(self):
+        """Build the search text now, so the first search need not."""
+        if self._keys is None:
+            self._build()
+
+    def _build(self):
+        paths = [str(p) for p in self._order]
+        skip = os.path.commonprefix(paths).rfind("/") + 1
+        keys = [p[skip : p.rfind(".")].lower() for p in paths]  # all have a suffix
+        self._keys = keys
+        self._text = "\n".join(keys)
+        self._starts = list(itertools.accumulate((len(k) + 1 for k in keys), initial=0))
+
+    def _find(self, term: str) -> set[int]:
+        if len(term) < 3:  # would match nearly everything; a plain scan is quicker
+            return {i for i, k in enumerate(self._keys) if term in k}
+        starts = self._starts
+        return {
+            bisect.bisect_right(starts, m.start()) - 1
+            for m in re.finditer(re.escape(term), self._text)
+        }
+
+    def search(self, query: str) -> list[Path]:
+        """Listed paths matching every term of query, in the listed order."""
+        query = query.lower()
+        if not query.split():
+            self._last = None
+            return list(self._order)
+        self.prepare()
+        pool = None
+        if self._last is not None and query.startswith(self._last[0]):
+            pool = self._last[1]
+        # Longest terms first: they have the fewest matches to re-check
+        for term in sorted(query.split(), key=len, reverse=True):
+            if pool is None:
+                pool = self._find(term)
+            else:
+                pool = {i for i in pool if term in self._keys[i]}
+        self._last = (query, pool)
+        return [self._order[i] for i in sorted(pool)]
+
+
+# ── Frame timing ──────────────────────────────────────────────────────────────
+
+
+class FrameStats:
+    """Per-frame timings for the carousel, kept only when WALL_PROFILE is set.
+
+    Latency runs from the animation asking for a frame to paintEvent
+    starting; intervals are measured between consecutive animation frames,
+    and one that overruns the display's refresh period by half is late.
+    """
+
+    BUCKETS_MS = (0.5, 1, 2, 4, 6, 8, 12, 16, 25, 33, 50, 100)
+
+    def __init__(self, refresh_hz: float, overlay: bool = False):
+        self.period = 1.0 / (refresh_hz or 60.0)
+        self.overlay = overlay
+        self.paint: list[float] = []
+        self.latency: list[float] = []
+        self.interval: list[float] = []
+        self.late = 0
+        self.dropped = 0
+        self.thumb_hits = 0
+        self.thumb_misses = 0
+        self.miss_frames = 0  # frames that drew at least one blank card
+        self.sprite_hits = 0
+        self.sprite_misses = 0
+        self._requested: float | None = None
+        self._last_frame: float | None = None
+
+    def requested(self):
+        if self._requested is None:
+            self._requested = time.perf_counter()
+
+    def rest(self):
+        """The animation stopped; the next frame starts a new run of intervals."""
+        self._last_frame = None
+
+    def painted(self, start: float, end: float, thumbs: tuple, sprites: tuple):
+        self.paint.append(end - start)
+        if self._requested is not None:
+            self.latency.append(start - self._requested)
+            if self._last_frame is not None:
+                dt = start - self._last_frame
+                self.interval.append(dt)
+                if dt > self.period * 1.5:
+                    self.late += 1
+                    self.dropped += round(dt / self.period) - 1
+            self._last_frame = start
+            self._requested = None
+        self.thumb_hits += thumbs[0]
+        self.thumb_misses += thumbs[1]
+        self.miss_frames += thumbs[1] > 0
+        self.sprite_hits += sprites[0]
+        self.sprite_misses += sprites[1]
+
+    @classmethod
+    def _summary(cls, samples: list[float]) -> dict:
+        ms = sorted(x * 1000 for x in samples)
+        if not ms:
+            return {"count": 0}
+        hist = {f"<={b}": 0 for b in cls.BUCKETS_MS}
+        hist["more"] = 0
+        for x in ms:
+            for b in cls.BUCKETS_MS:
+                if x <= b:
+                    hist[f"<={b}"] += 1
+                    break
+            else:
+                hist["more"] += 1
+
+        def pick(q: float) -> float:
+            return round(ms[min(len(ms) - 1, int(q * len(ms)))], 3)
+
+        return {
+            "count": len(ms),
+            "mean": round(sum(ms) / len(ms), 3),
+            "p50": pick(0.50),
+            "p95": pick(0.95),
+            "p99": pick(0.99),
+            "max": round(ms[-1], 3),
+            "histogram": hist,
+        }
+
+    def summary(self) -> dict:
+        return {
+            "refresh_hz": round(1.0 / self.period, 2),
+            "frames": len(self.paint),
+            "paint_ms": self._summary(self.paint),
+            "latency_ms": self._summary(self.latency),
+            "interval_ms": self._summary(self.interval),
+            "late": self.late,
+            "dropped": self.dropped,
+            "thumbs": {
+                "hits": self.thumb_hits,
+                "misses": self.thumb_misses,
+                "frames_with_miss": self.miss_frames,
+            },
+            "sprites": {"hits": self.sprite_hits, "misses": self.sprite_misses},
+        }
+
+    def dump(self, path: Path | None = None):
+        path = path or PROFILE_OUT
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(self.summary(), indent=2))
+            print(f"wall.py: frame timings written to {path}", file=sys.stderr)
+        except OSError:
+            pass
+
+    def draw(self, p: QtGui.QPainter):
+        """Live readout in the top-left corner."""
+        recent = self.paint[-60:]
+        gaps = self.interval[-60:]
+        fps = len(gaps) / sum(gaps) if gaps else 0.0
+        lines = [
+            f"paint {recent[-1] * 1000:5.2f} ms  max {max(recent) * 1000:5.2f}",
+            f"fps {fps:5.1f}  late {self.late}  dropped {self.dropped}",
+            f"thumbs {self.thumb_hits} hit / {self.thumb_misses} miss",
+        ]
+        p.setOpacity(0.85)
+        p.setPen(QtCore.Qt.PenStyle.NoPen)
+        p.setBrush(QtGui.QColor(0, 0, 0, 170))
+        p.drawRoundedRect(QtCore.QRectF(8, 8, 250, 16 * len(lines) + 10), 5, 5)
+        p.setPen(QtGui.QColor(255, 255, 255))
+        p.setFont(get_font(9))
+        for i, line in enumerate(lines):
+            p.drawText(16, 26 + 16 * i, line)
 
 
 # ── Carousel widget ───────────────────────────────────────────────────────────
 
 
 class Carousel(QtWidgets.QWidget):
-    def __init__(self, images: list[Path]):
+    @TRACE.timed
+    def __init__(self, images: list[Path], resident: bool = False):
         super().__init__()
         self.setWindowTitle("WallpaperPicker")
         self.images = images
         self.n = len(images)
-
-        self.thumbs: dict[int, QtGui.QPixmap] = {}
+        self._index_of = {str(p): i for i, p in enumerate(images)}
+        # While a filter is typed, images holds just the matches of _all
+        self._all = images
+        self._names = NameIndex()
+        self._names.set_order(images)
+        self._query: str | None = None  # None when not filtering
+        self._matched = self.n
+        # A resident carousel hides on close and waits to be summoned again
+        self.resident = resident
+
+        self.thumbs = ThumbStore(self.n)
         self.bg_pixmap: QtGui.QPixmap | None = None
-        self._bg_loader: BgLoader | None = None
+        self._bg_cache: OrderedDict[str, QtGui.QPixmap] = OrderedDict()
+        self._dpr = device_pixel_ratio()
+        self._sprites = SpriteCache(self._dpr)
+        self._layout_key: tuple[float, int] | None = None
+        self._layout_cards: list[tuple[int, int, int, float, float]] = []
+        self._stats: FrameStats | None = None
+        if PROFILE:
+            screen = QtGui.QGuiApplication.primaryScreen()
+            hz = screen.refreshRate() if screen else 60.0
+            self._stats = FrameStats(hz, overlay=PROFILE == "overlay")
 
         # Find index of current wallpaper
-        cw = current_wall()
-        self._index = 0
-        if cw:
-            for i, p in enumerate(images):
-                if str(p) == cw:
-                    self._index = i
-                    break
+        self._index = self._index_of.get(current_wall() or "", 0)
+        self.thumbs.set_centre(self._index)
 
         # _pos: animated float index of the visual centre card.
         # _target: where _pos is heading (advances by ±1 per scroll step).
-        # We use a spring/lerp loop via QTimer rather than QPropertyAnimation
-        # so repaints are frame-locked and rapid scrolls accumulate smoothly.
+        # The spring is stepped from paintEvent, and each moving frame asks
+        # for the next with update(). Qt turns that into a window update
+        # request paced by the compositor's frame callbacks, so frames match
+        # the display, rapid scrolls accumulate smoothly, and nothing runs
+        # once the carousel is at rest.
         self._pos = float(self._index)
         self._target = float(self._index)
-
-        # Frame timer — fires every ~8 ms (~120 fps ceiling), stops when at rest
-        self._anim_timer = QtCore.QTimer(self)
-        self._anim_timer.setInterval(8)
-        self._anim_timer.timeout.connect(self._anim_tick)
+        self._animating = False
+        self._clock = QtCore.QElapsedTimer()  # time since the last spring step
 
         # Pywal colours
         self.BG, self.FG, self.ACC, self.ACC2 = load_pywal()
 
+        # Last launch's frame, if it was of this very state: it is shown
+        # until the visible thumbnails and the background are in
+        self._snapshot = load_snapshot(self._snapshot_key())
+        self._saved_key: str | None = None  # what the last save was keyed on
+        self._theme_pending = False  # applied, and pywal not yet finished
+        self._job: ApplyJob | None = None  # the last wallpaper applied
+        self._snap_timer = QtCore.QTimer(self)
+        self._snap_timer.setSingleShot(True)
+        self._snap_timer.setInterval(SNAPSHOT_LIVE_MS)
+        self._snap_timer.timeout.connect(lambda: self._go_live(force=True))
+        if self._snapshot is not None:
+            self._snap_timer.start()
+
         # Window
         self.setWindowFlags(
             QtCore.Qt.WindowType.FramelessWindowHint
@@ -204,11 +2203,45 @@ class Carousel(QtWidgets.QWidget):
         screen = QtGui.QGuiApplication.primaryScreen().availableGeometry()
         self.move(screen.center() - self.rect().center())
 
-        # Kick off background load (async — no stutter on open)
+        # Optional scene-graph renderer; it covers the window and draws from
+        # this widget's state, so paintEvent only has to poke it
+        self._quick = None
+        if RENDERER == "quick":
+            try:
+                import wall_quick
+
+                self._quick = wall_quick.QuickLayer(self)
+            except ImportError:
+                pass
+
+        # Kick off background load (async — no stutter on open). Later loads
+        # wait for the carousel to settle so scrolling never queues decodes.
+        self._bg_loader = BgLoader(self._dpr)
+        self._bg_loader.ready.connect(self._on_bg_ready)
+        self._bg_loader.start()
+        self._bg_timer = QtCore.QTimer(self)
+        self._bg_timer.setSingleShot(True)
+        self._bg_timer.setInterval(BG_SETTLE_MS)
+        self._bg_timer.timeout.connect(lambda: self._load_bg(self._index))
+        self._variants = VariantMaker()
+        self._variants.start()
+        self._variant_timer = QtCore.QTimer(self)
+        self._variant_timer.setSingleShot(True)
+        self._variant_timer.setInterval(VARIANT_IDLE_MS)
+        self._variant_timer.timeout.connect(self._make_variants)
+
+        # An animated centre card plays once the carousel settles on it
+        self._frames = FrameRing(round(THUMB_W * self._dpr), round(THUMB_H * self._dpr))
+        self._frames.start()
+        self._anim_path: Path | None = None
+        self._anim_px: QtGui.QPixmap | None = None
+        self._anim_timer = QtCore.QTimer(self)
+        self._anim_timer.setSingleShot(True)
+        self._anim_timer.timeout.connect(self._next_frame)
         self._load_bg(self._index)
 
         # Load thumbnails from background thread
-        self._loader = ThumbLoader(images, centre=self._index)
+        self._loader = ThumbLoader(images, centre=self._index, dpr=self._dpr)
         self._loader.loaded.connect(self._on_thumb)
         self._loader.start()
 
@@ -219,55 +2252,406 @@ class Carousel(QtWidgets.QWidget):
                 self._watcher.addPath(str(f))
         self._watcher.fileChanged.connect(self._refresh_theme)
 
-    # ── Animation tick ────────────────────────────────────────────────────────
+    # ── Animation ─────────────────────────────────────────────────────────────
+
+    def _animate(self):
+        if not self._animating:
+            self._animating = True
+            self._clock.start()
+            self.update()
 
-    def _anim_tick(self):
-        """Spring-lerp _pos toward _target each timer tick; stop when close enough."""
-        diff = self._target - self._pos
-        if abs(diff) < 0.0005:
+    def _step(self):
+        """Advance the spring by the time since the last frame; settle when close."""
+        # Clamp so a stalled frame doesn't teleport the carousel
+        dt = min(self._clock.restart() / 1000, 0.05)
+        self._pos += (self._target - self._pos) * (1 - math.exp(-SPRING_RATE * dt))
+        if abs(self._target - self._pos) < 0.0005:
             self._pos = self._target
-            self._anim_timer.stop()
-        else:
-            self._pos += diff * SPRING
-        self.update()
+            self._animating = False
+            # At rest — stop favouring the last direction of travel
+            self._loader.set_centre(self._index)
+            if self._stats is not None:
+                self._stats.rest()
 
     # ── Slots ─────────────────────────────────────────────────────────────────
 
-    def _on_thumb(self, i: int, px: QtGui.QPixmap):
-        self.thumbs[i] = px
-        self.update()
+    def _on_thumb(self, path: str, img: QtGui.QImage):
+        i = self._index_of.get(path)
+        if i is not None:
+            self.thumbs.put(i, img)
+            self._go_live()
+            self.update()
 
-    def _on_bg_ready(self, px: QtGui.QPixmap):
-        self.bg_pixmap = px
-        self.update()
+    def _on_bg_ready(self, path: str, img: QtGui.QImage):
+        px = QtGui.QPixmap.fromImage(img)
+        px.setDevicePixelRatio(self._dpr)
+        self._bg_cache[path] = px
+        while len(self._bg_cache) > BG_CACHE_SIZE:
+            self._bg_cache.popitem(last=False)
+        if path == str(self.images[self._index]):
+            self.bg_pixmap = px
+            self._go_live()
+            self.update()
 
     def _refresh_theme(self):
         self.BG, self.FG, self.ACC, self.ACC2 = load_pywal()
+        self._theme_pending = False
+        self.update()
+
+    # ── Resident mode ─────────────────────────────────────────────────────────
+
+    def set_images(self, images: list[Path], current: Path | None = None):
+        """Swap in a new wallpaper list, keeping thumbnails for paths in both.
+
+        The centre stays on current (default: the card centred now) when it
+        is still listed. An empty list is ignored — the carousel always has
+        something to show. A filter being typed applies to the new list.
+        """
+        if not images:
+            return
+        self._all = images
+        self._names.set_order(images)
+        if self._query:
+            self._filter(self._query, current)
+        else:
+            self._show(images, current)
+
+    def splice(self, added: list[Path], removed: list[Path]):
+        """Take in paths added to and removed from the list, as WallIndex reports.
+
+        Added paths go where a name sort would put them. Indices before the
+        first change are left alone and only the thumbnails held are
+        remapped, so a new image costs little however long the list is.
+        """
+
+        def key(p: Path) -> str:
+            return str(p).lower()  # the order _sort_by_name() gives
+
+        if self._query is not None:
+            # The matches are searched again whatever changed
+            dropped = set(map(str, removed))
+            images = [p for p in self._all if str(p) not in dropped]
+            for p in added:
+                bisect.insort(images, p, key=key)
+            self.set_images(images)
+            return
+        index_of = self._index_of
+        gone = sorted({index_of[str(p)] for p in removed if str(p) in index_of})
+        fresh = sorted({p for p in added if str(p) not in index_of}, key=key)
+        if not fresh and (not gone or len(gone) == self.n):
+            return  # nothing to do, or nothing left to show
+        old = self.images
+        images = old.copy()
+        for i in reversed(gone):
+            del images[i]
+        at: list[int] = []  # where the fresh paths end up
+        for p in fresh:
+            i = bisect.bisect_right(images, key(p), key=key)
+            images.insert(i, p)
+            at = [j + (j >= i) for j in at] + [i]
+        at.sort()
+        renumber = splice_map(gone, at)
+        for i in gone:
+            del index_of[str(old[i])]
+        lo = min(gone[:1] + at[:1])
+        index_of.update(zip(map(str, images[lo:]), range(lo, len(images))))
+
+        self._go_live(force=True)
+        centre = renumber(self._index)
+        if centre is None:
+            centre = min(self._index, len(images) - 1)
+            self._pos = self._target = float(centre)
+        else:
+            # Keep a scroll in flight going, shifted with its cards
+            self._pos += centre - self._index
+            self._target += centre - self._index
+        moved = {i: renumber(i) for i in self.thumbs.indices()}
+        moved = {i: j for i, j in moved.items() if j is not None}
+        self.images = self._all = images
+        self.n = self._matched = len(images)
+        self._names.set_order(images)
+        self._index = centre
+        self._layout_key = None
+        restored = self.thumbs.remap(moved, self.n, old, index_of)
+        self.thumbs.set_centre(self._index)
+        wanted = set(at).difference(restored)
+        self._loader.splice(images, renumber, lo, removed, sorted(wanted))
+        self._bg_timer.start()
+        self._variant_timer.stop()
+        self.update()
+
+    def _show(
+        self,
+        images: list[Path],
+        current: Path | None = None,
+        keep: list[int] | None = None,
+    ):
+        """Put images up in place of the list shown, keeping thumbnails of both.
+
+        keep, when images only drops entries from the list shown, holds the
+        old index of each; the loader then renumbers just those.
+        """
+        self._go_live(force=True)
+        current = str(current or self.images[self._index])
+        new_index = dict(zip(map(str, images), range(len(images))))
+        old = self.images
+        moved = {}
+        for i in self.thumbs.indices():
+            j = new_index.get(str(old[i]))
+            if j is not None:
+                moved[i] = j
+        self.images = images
+        self.n = len(images)
+        self._index_of = new_index
+        self._index = new_index.get(current, min(self._index, self.n - 1))
+        self._pos = self._target = float(self._index)
+        self._layout_key = None
+        restored = self.thumbs.remap(moved, self.n, old, new_index)
+        self.thumbs.set_centre(self._index)
+        if keep is not None:
+            self._loader.narrow(images, keep, self._index)
+        else:
+            loaded = (images[i] for i in restored)
+            self._loader.set_images(images, self._index, loaded)
+        self._bg_timer.start()
+        self._variant_timer.stop()
+        self.update()
+
+    def _sort_by_colour(self, colour: str | None = None):
+        """Reorder by likeness to colour (hex), or to the centre card if None.
+
+        The best match is centred and the rest alternate right and left of
+        it, so both neighbours are close. Thumbnails are kept, not reloaded.
+        The whole list is sorted, so a filter keeps its matches in the new
+        order and the best of them centred.
+        """
+        index = self._loader.colours
+        if index is None:
+            return
+        images = self._all
+        if colour is None:
+            ranked = index.like_image(images, self.images[self._index])
+        else:
+            ranked = index.like_colour(images, colour)
+        order: list[Path] = [images[0]] * len(images)
+        for r, i in enumerate(ranked):
+            slot = (r + 1) // 2 if r % 2 else -(r // 2)
+            order[slot % len(images)] = images[i]
+        best = next(
+            (images[i] for i in ranked if str(images[i]) in self._index_of), order[0]
+        )
+        self.set_images(order, current=best)
+
+    def _sort_by_name(self):
+        self.set_images(sorted(self._all, key=lambda p: str(p).lower()))
+
+    # ── Snapshot ──────────────────────────────────────────────────────────────
+
+    def _snapshot_key(self) -> str:
+        theme = (self.BG, self.FG, self.ACC, self.ACC2)
+        return snapshot_key(self.images, self.images[self._index], self._dpr, theme)
+
+    def _go_live(self, force: bool = False):
+        """Replace the snapshot with live frames once they would look the same."""
+        if self._snapshot is None:
+            return
+        if not force:
+            if str(self.images[self._index]) not in self._bg_cache:
+                return
+            if any(idx not in self.thumbs for _, _, idx, _, _ in self._layout()):
+                return
+        self._snapshot = None
+        self._snap_timer.stop()
         self.update()
 
+    def _save_snapshot(self):
+        """Keep this frame for the next launch, if it is settled and complete.
+
+        The next launch centres on the current wallpaper, so the key uses the
+        centre card: a frame left on another card simply never matches. Nor
+        does one taken while pywal is still rewriting the colours.
+        """
+        if self._snapshot is not None or self._query is not None or not self.n:
+            return  # what is on disk is still right, or nothing worth keeping
+        if self._theme_pending:
+            return
+        self._pos = self._target = float(self._index)
+        self._animating = False
+        if str(self.images[self._index]) not in self._bg_cache:
+            return
+        if any(idx not in self.thumbs for _, _, idx, _, _ in self._layout()):
+            return
+        key = self._snapshot_key()
+        if key != self._saved_key:
+            save_snapshot(key, self.grab().toImage())
+            self._saved_key = key
+
+    # ── Search ────────────────────────────────────────────────────────────────
+
+    def _filter(self, query: str, current: Path | None = None):
+        """Show only the images matching query; all of them if it is blank.
+
+        With no match the last matches stay up, so the carousel never
+        empties. A query that extends the one shown only drops cards, so
+        those that stay are renumbered rather than the whole list.
+        """
+        narrowing = current is None and (
+            self._query is None
+            or (len(query) > len(self._query) and query.startswith(self._query))
+        )
+        self._query = query
+        matches = self._names.search(query)
+        self._matched = len(matches)
+        if not matches:
+            pass
+        elif not narrowing:
+            self._show(matches, current)
+        elif len(matches) < self.n:
+            index_of = self._index_of
+            self._show(matches, keep=[index_of[str(p)] for p in matches])
+        if not query:
+            # Between opening the filter and the first key
+            QtCore.QTimer.singleShot(0, self._names.prepare)
+        self.update()
+
+    def _end_filter(self):
+        self._query = None
+        self._matched = len(self._all)
+        self._show(self._all)
+
+    def _type(self, e: QtGui.QKeyEvent) -> bool:
+        """Edit the filter with e; False for keys it leaves to the carousel."""
+        k = e.key()
+        if k == QtCore.Qt.Key.Key_Escape:
+            self._end_filter()
+        elif k == QtCore.Qt.Key.Key_Backspace:
+            if self._query:
+                self._filter(self._query[:-1])
+            else:
+                self._end_filter()
+        elif (
+            e.text().isprintable()
+            and e.text()
+            and not (
+                e.modifiers()
+                & (
+                    QtCore.Qt.KeyboardModifier.ControlModifier
+                    | QtCore.Qt.KeyboardModifier.AltModifier
+                )
+            )
+        ):
+            self._filter(self._query + e.text())
+        else:
+            return False
+        return True
+
+    def hint(self) -> str:
+        """The text of the bar along the bottom: key help, or the filter."""
+        if self._query is None:
+            return HINT
+        if not self._matched:
+            return f"/{self._query}   ·   no matches   ·   Esc to clear"
+        return (
+            f"/{self._query}   ·   {self._matched} of {len(self._all)}   ·   "
+            "Enter to set   ·   Esc to clear"
+        )
+
+    def summon(self):
+        """Show the resident carousel again, centred on the current wallpaper."""
+        self._refresh_theme()
+        if self._query is not None:
+            self._end_filter()
+        self._index = self._index_of.get(current_wall() or "", self._index)
+        self._pos = self._target = float(self._index)
+        self._layout_key = None
+        self.thumbs.set_centre(self._index)
+        self._loader.set_centre(self._index)
+        self._load_bg(self._index)
+        screen = QtGui.QGuiApplication.primaryScreen().availableGeometry()
+        self.move(screen.center() - self.rect().center())
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
     # ── Background loading ────────────────────────────────────────────────────
 
+    @TRACE.timed
     def _load_bg(self, idx: int):
-        """Start an async background image load for the given index."""
-        # Prefer an already-loaded thumb if available and large enough — good enough as bg
-        if idx in self.thumbs:
-            self.bg_pixmap = self.thumbs[idx].scaled(
-                WIN_W,
-                WIN_H,
-                QtCore.Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                QtCore.Qt.TransformationMode.SmoothTransformation,
-            )
+        """Show idx's background from cache, else a stretched thumb until it decodes.
+
+        Neighbours are queued behind it so the next step is usually a cache hit.
+        """
+        wanted = []
+        px = self._bg_cache.get(str(self.images[idx]))
+        if px is not None:
+            self._bg_cache.move_to_end(str(self.images[idx]))
+            self.bg_pixmap = px
             self.update()
+        else:
+            wanted.append(self.images[idx])
+            thumb = self.thumbs.get(idx)
+            if thumb is not None:
+                self.bg_pixmap = thumb.scaled(
+                    round(WIN_W * self._dpr),
+                    round(WIN_H * self._dpr),
+                    QtCore.Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                    QtCore.Qt.TransformationMode.SmoothTransformation,
+                )
+                self.bg_pixmap.setDevicePixelRatio(self._dpr)
+                self.update()
+        for d in (1, -1):
+            path = self.images[(idx + d) % self.n]
+            if str(path) not in self._bg_cache and path not in wanted:
+                wanted.append(path)
+        self._bg_loader.request(wanted)
+        if not self._play(idx):
+            # An animation is handed over whole, so it gets no still variants
+            self._variant_timer.start()
+
+    def _make_variants(self):
+        """Queue screen-sized copies of the card the carousel has rested on."""
+        if self._anim_path is None and self.isVisible():
+            self._variants.request(self.images[self._index], outputs())
+
+    # ── Animation ─────────────────────────────────────────────────────────────
+
+    def _play(self, idx: int) -> bool:
+        """Start playing idx if it is animated; whether it is."""
+        path = self.images[idx]
+        if path == self._anim_path:
+            return True
+        self._pause()
+        if not is_animated(path):
+            return False
+        self._anim_path = path
+        self._frames.play(path)
+        self._anim_timer.start(0)
+        return True
+
+    def _pause(self):
+        if self._anim_path is None:
             return
+        self._frames.play(None)
+        self._anim_timer.stop()
+        self._anim_path = self._anim_px = None
+        self.update()
 
-        # Stop any previous bg load
-        if self._bg_loader and self._bg_loader.isRunning():
-            self._bg_loader.ready.disconnect()
-            self._bg_loader.quit()
+    def _next_frame(self):
+        frame = self._frames.take()
+        if frame is None:
+            if self._frames.playing():
+                self._anim_timer.start(ANIM_POLL_MS)
+            return
+        img, delay = frame
+        self._anim_px = QtGui.QPixmap.fromImage(img)
+        self._anim_timer.start(delay if delay > 10 else ANIM_DEFAULT_MS)
+        self.update()
 
-        self._bg_loader = BgLoader(self.images[idx])
-        self._bg_loader.ready.connect(self._on_bg_ready)
-        self._bg_loader.start()
+    def frame(self, idx: int) -> QtGui.QPixmap | None:
+        """The animation frame to draw for card idx, if it is the one playing."""
+        if self._anim_px is not None and self.images[idx] == self._anim_path:
+            return self._anim_px
+        return None
 
     # ── Navigation ────────────────────────────────────────────────────────────
 
@@ -275,13 +2659,16 @@ class Carousel(QtWidgets.QWidget):
         # Advance _target by the signed delta so rapid presses accumulate
         # rather than restarting — the spring catches up naturally.
         delta = new_index - self._index
+        self._go_live(force=True)
+        self._pause()
         self._index = new_index % self.n
         self._target += delta
+        self.thumbs.set_centre(self._index)
+        self._loader.set_centre(self._index, 1 if delta > 0 else -1)
 
-        if not self._anim_timer.isActive():
-            self._anim_timer.start()
-
-        self._load_bg(self._index)
+        self._animate()
+        self._bg_timer.start()
+        self._variant_timer.stop()
 
     def go_left(self):
         self._scroll_to(self._index - 1)
@@ -291,26 +2678,28 @@ class Carousel(QtWidgets.QWidget):
 
     def _apply(self):
         path = self.images[self._index]
-        if SETWALL.exists():
-            subprocess.Popen(["bash", str(SETWALL), str(path)], start_new_session=True)
-        else:
-            for cmd in (
-                ["awww", "img", str(path), "--transition-type", "fade"],
-                ["swww", "img", str(path)],
-                ["feh", "--bg-fill", str(path)],
-            ):
-                try:
-                    subprocess.Popen(
-                        cmd, stderr=subprocess.DEVNULL, start_new_session=True
-                    )
-                    break
-                except FileNotFoundError:
-                    continue
+        if self._job is not None:
+            self._job.wait()  # the last wallpaper applied must be the one set
+        # Variants are looked up here: only the GUI thread may list screens
+        self._job = ApplyJob(path, variants(path, outputs()))
+        self._job.done.connect(self._on_applied)
+        self._theme_pending = True
+        self._job.start()
         self.close()
 
+    def _on_applied(self, ready: bool):
+        if ready:
+            # Whoever shows next gets the new colours; a hidden resident
+            # carousel keeps its frame for the next launch in them too
+            self._refresh_theme()
+            if not self.isVisible():
+                self._save_snapshot()
+
     # ── Input ─────────────────────────────────────────────────────────────────
 
     def keyPressEvent(self, e: QtGui.QKeyEvent):
+        if self._query is not None and self._type(e):
+            return
         k = e.key()
         if k in (QtCore.Qt.Key.Key_Left, QtCore.Qt.Key.Key_H, QtCore.Qt.Key.Key_A):
             self.go_left()
@@ -322,6 +2711,14 @@ class Carousel(QtWidgets.QWidget):
             QtCore.Qt.Key.Key_Space,
         ):
             self._apply()
+        elif k == QtCore.Qt.Key.Key_C:
+            self._sort_by_colour()
+        elif k == QtCore.Qt.Key.Key_V:
+            self._sort_by_colour(self.ACC)  # pywal color4
+        elif k == QtCore.Qt.Key.Key_N:
+            self._sort_by_name()
+        elif k == QtCore.Qt.Key.Key_Slash:
+            self._filter("")
         elif k == QtCore.Qt.Key.Key_Escape:
             self.close()
 
@@ -337,35 +2734,13 @@ class Carousel(QtWidgets.QWidget):
             return
 
         mx = e.position().x()
-        cx = WIN_W / 2
         best = None  # (abs_dist_from_click, signed_offset)
 
         # Test every rendered card and find the closest one to the click
-        # anim_offset: how far _pos has travelled past the nearest integer
-        anim_offset = self._pos - round(self._pos)
-
-        for di in range(-VISIBLE, VISIBLE + 1):
-            idx_mod = (self._index + di) % self.n
-            vdist = di - anim_offset
-            adist = abs(vdist)
-            if adist > VISIBLE + 0.5:
-                continue
-
-            # Replicate the same scale/skew from paintEvent
-            t = min(adist, 1.0)
-            scale = CENTER_SCALE + (SIDE_SCALE - CENTER_SCALE) * t
-            if adist > 1.0:
-                scale = SIDE_SCALE * max(0.0, 1.0 - (adist - 1.0) * 0.22)
-
-            cw = int(CARD_W * scale)
-            skew_px = int(cw * SKEW)
-            total_w = cw + skew_px
-            x_centre = cx + vdist * SPACING
-            x_left = x_centre - total_w / 2
-            x_right = x_centre + total_w / 2
-
-            if x_left <= mx <= x_right:
-                dist = abs(mx - x_centre)
+        for q, di, _idx, x0, _y0 in self._layout():
+            total_w = LAYOUT[q].total_w
+            if x0 <= mx <= x0 + total_w:
+                dist = abs(mx - (x0 + total_w / 2))
                 if best is None or dist < best[0]:
                     best = (dist, di)
 
@@ -379,23 +2754,112 @@ class Carousel(QtWidgets.QWidget):
             self._scroll_to(self._index + offset)
 
     def closeEvent(self, e):
-        self._anim_timer.stop()
+        if self._stats is not None:
+            self._stats.dump()
+        if self.resident:
+            # Keep threads and caches warm; just settle and get out of the way
+            e.ignore()
+            self._save_snapshot()  # for the first summon of the next daemon
+            self._animating = False
+            self._bg_timer.stop()
+            self._variant_timer.stop()
+            self._pause()
+            self._pos = self._target = float(self._index)
+            self.hide()
+            return
+        if self._job is not None:
+            # setwall.sh starts from the job, so the process waits it out
+            self.hide()
+            self._job.wait()
+            if self._job.ready:
+                self._refresh_theme()
+        self._save_snapshot()
+        self._animating = False
         self._loader.stop()
-        if self._bg_loader and self._bg_loader.isRunning():
-            self._bg_loader.quit()
-            self._bg_loader.wait()
+        self._bg_timer.stop()
+        self._variant_timer.stop()
+        self._bg_loader.stop()
+        self._variants.stop()
+        self._anim_timer.stop()
+        self._frames.stop()
         super().closeEvent(e)
 
+    # ── Layout ────────────────────────────────────────────────────────────────
+
+    def _layout(self) -> list[tuple[int, int, int, float, float]]:
+        """Drawn cards as (level, offset, index, x0, y0), farthest first.
+
+        Computed once per _pos and shared by paintEvent and mousePressEvent.
+        """
+        key = (self._pos, self._index)
+        if key == self._layout_key:
+            return self._layout_cards
+
+        # anim_offset: fractional overshoot of _pos past the nearest integer.
+        # Subtracting it from di gives each card its correct visual position
+        # during animation — positive when scrolling right, negative when left.
+        anim_offset = self._pos - round(self._pos)
+        last = len(LAYOUT) - 1
+        cards = []
+        for di in range(-VISIBLE, VISIBLE + 1):
+            vdist = di - anim_offset
+            q = min(round(abs(vdist) * SPRITE_STEPS), last)
+            g = LAYOUT[q]
+            if g.alpha <= 0.01:
+                continue
+            x0 = WIN_W / 2 + vdist * SPACING - g.total_w / 2
+            y0 = WIN_H / 2 - g.ch / 2
+            cards.append((q, di, (self._index + di) % self.n, x0, y0))
+
+        # Draw farthest-from-centre first so centre is on top
+        cards.sort(key=lambda c: c[0], reverse=True)
+        self._layout_key = key
+        self._layout_cards = cards
+        return cards
+
     # ── Paint ─────────────────────────────────────────────────────────────────
 
     def paintEvent(self, _):
+        if self._quick is not None:
+            self._quick.scene.update()
+            return
+        if self._snapshot is not None:
+            QtGui.QPainter(self).drawImage(0, 0, self._snapshot)
+            return
+        if self._animating:
+            self._step()
+        stats = self._stats
+        if stats is None:
+            self._paint()
+        else:
+            self._paint_timed(stats)
+        if self._animating:
+            if stats is not None:
+                stats.requested()
+            self.update()  # next frame, when the display is ready for it
+
+    def _paint_timed(self, stats: FrameStats):
+        thumbs = (self.thumbs.hits, self.thumbs.misses)
+        sprites = (self._sprites.hits, self._sprites.misses)
+        start = time.perf_counter()
+        self._paint()
+        stats.painted(
+            start,
+            time.perf_counter(),
+            (self.thumbs.hits - thumbs[0], self.thumbs.misses - thumbs[1]),
+            (self._sprites.hits - sprites[0], self._sprites.misses - sprites[1]),
+        )
+        if stats.overlay:
+            stats.draw(QtGui.QPainter(self))
+
+    @TRACE.timed
+    def _paint(self):
         p = QtGui.QPainter(self)
         p.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
         p.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform)
 
         W, H = WIN_W, WIN_H
         cx = W / 2
-        cy = H / 2
 
         # ── Background ────────────────────────────────────────────────────────
         if self.bg_pixmap:
@@ -411,78 +2875,31 @@ class Carousel(QtWidgets.QWidget):
             )
             return
 
-        # ── Build card list ───────────────────────────────────────────────────
-        # anim_offset: fractional overshoot of _pos past the nearest integer.
-        # Subtracting it from di gives each card its correct visual position
-        # during animation — positive when scrolling right, negative when left.
-        anim_offset = self._pos - round(self._pos)
-
-        cards = []
-        for di in range(-VISIBLE, VISIBLE + 1):
-            idx = (self._index + di) % self.n
-            vdist = di - anim_offset
-            adist = abs(vdist)
-            alpha_f = max(0.0, 1.0 - adist * 0.17)
-            if alpha_f <= 0.01:
-                continue
-            cards.append((adist, vdist, idx, int(alpha_f * 255)))
-
-        # Draw farthest-from-centre first so centre is on top
-        cards.sort(key=lambda t: t[0], reverse=True)
-
-        for adist, vdist, idx, alpha in cards:
-            # ── Scale ─────────────────────────────────────────────────────────
-            t = min(adist, 1.0)
-            scale = CENTER_SCALE + (SIDE_SCALE - CENTER_SCALE) * t
-            if adist > 1.0:
-                scale = SIDE_SCALE * max(0.0, 1.0 - (adist - 1.0) * 0.22)
-
-            cw = int(CARD_W * scale)
-            ch = int(CARD_H * scale)
-            skew_px = int(cw * SKEW)
-            total_w = cw + skew_px
-
-            x_centre = cx + vdist * SPACING
-            y_centre = cy
-            x0 = x_centre - total_w / 2
-            y0 = y_centre - ch / 2
-
-            # ── Parallelogram path ────────────────────────────────────────────
-            path = QtGui.QPainterPath()
-            path.moveTo(x0 + skew_px, y0)
-            path.lineTo(x0 + skew_px + cw, y0)
-            path.lineTo(x0 + cw, y0 + ch)
-            path.lineTo(x0, y0 + ch)
-            path.closeSubpath()
-
-            p.save()
-            p.setOpacity(alpha / 255)
-            p.setClipPath(path)
-
-            # ── Thumbnail or placeholder ──────────────────────────────────────
-            if idx in self.thumbs:
-                src = self.thumbs[idx]
-                sw, sh = src.width(), src.height()
-                s = max(total_w / sw, ch / sh)
-                dw = sw * s
-                dh = sh * s
-                dx = x0 + (total_w - dw) / 2
-                dy = y0 + (ch - dh) / 2
-                p.drawPixmap(QtCore.QRectF(dx, dy, dw, dh).toRect(), src)
+        for q, di, idx, x0, y0 in self._layout():
+            g = LAYOUT[q]
+            adist = q / SPRITE_STEPS
+
+            src = self.thumbs.get(idx)
+            if src is None and self.thumbs.take_gone(idx):
+                self._loader.request(idx)
+            frame = self.frame(idx) if di == 0 else None
+            if frame is not None:
+                qs = q
+                sprite = self._sprites.render(frame, q)
             else:
-                # Animated shimmer placeholder while loading
-                grad = QtGui.QLinearGradient(x0, y0, x0 + total_w, y0)
-                grad.setColorAt(0.0, QtGui.QColor(30, 30, 45))
-                grad.setColorAt(0.5, QtGui.QColor(50, 50, 70))
-                grad.setColorAt(1.0, QtGui.QColor(30, 30, 45))
-                p.fillPath(path, QtGui.QBrush(grad))
-
-            # ── Side-card darkening ───────────────────────────────────────────
-            if adist > 0.05:
-                darkness = int(min(adist, 1.5) / 1.5 * 140)
-                p.fillPath(path, QtGui.QColor(0, 0, 0, darkness))
-
-            p.restore()
+                qs = sprite_level(q)
+                sprite = self._sprites.get(src, qs)
+            p.setOpacity(g.alpha)
+            if qs == q:
+                p.drawPixmap(QtCore.QPointF(x0, y0), sprite)
+            else:
+                gs, dpr = LAYOUT[qs], sprite.devicePixelRatio()
+                p.drawPixmap(
+                    QtCore.QRectF(x0, y0, g.total_w, g.ch),
+                    sprite,
+                    QtCore.QRectF(0, 0, gs.total_w * dpr, gs.ch * dpr),
+                )
+            p.setOpacity(1.0)
 
             # ── Centre-card accent border ─────────────────────────────────────
             if adist < 0.12:
@@ -492,10 +2909,9 @@ class Carousel(QtWidgets.QWidget):
                 pen = QtGui.QPen(c)
                 pen.setWidthF(2.0)
                 p.save()
-                p.setOpacity(1.0)
                 p.setPen(pen)
                 p.setBrush(QtCore.Qt.BrushStyle.NoBrush)
-                p.drawPath(path)
+                p.drawPath(card_path(x0, y0, g))
                 p.restore()
 
             # ── Filename label beneath centre card ────────────────────────────
@@ -508,7 +2924,7 @@ class Carousel(QtWidgets.QWidget):
                 fm = QtGui.QFontMetrics(font)
                 tw = fm.horizontalAdvance(name)
                 tx = int(cx - tw / 2)
-                ty = int(y0 + ch + 28)
+                ty = int(y0 + g.ch + 28)
                 p.setPen(QtGui.QColor(0, 0, 0, 200))
                 p.drawText(tx + 1, ty + 1, name)
                 p.setPen(QtGui.QColor(255, 255, 255, 230))
@@ -516,28 +2932,125 @@ class Carousel(QtWidgets.QWidget):
                 p.restore()
 
         # ── Hint bar ─────────────────────────────────────────────────────────
-        p.setOpacity(0.30)
+        p.setOpacity(0.30 if self._query is None else 0.85)
         p.setPen(QtGui.QColor(255, 255, 255))
         p.setFont(get_font(10))
         p.drawText(
             QtCore.QRect(0, H - 26, W, 20),
             QtCore.Qt.AlignmentFlag.AlignHCenter,
-            "← → / hjkl / scroll   ·   Enter to set   ·   Esc to close",
+            self.hint(),
         )
         p.setOpacity(1.0)
 
 
+# ── Daemon ────────────────────────────────────────────────────────────────────
+
+
+class WallDaemon(QtCore.QObject):
+    """Keeps one Carousel resident and toggles it for clients on SOCKET.
+
+    Commands are single lines: "toggle\t<dir>" (dir may be empty for the
+    default) and "ping". The reply is "ok", or "empty" when the directory
+    has no wallpapers so the client can start normally and say so.
+    """
+
+    def __init__(self, directory: Path):
+        super().__init__()
+        self.directory = directory
+        self.index: WallIndex | None = None
+        self.carousel: Carousel | None = None
+        self._server = QtNetwork.QLocalServer(self)
+        self._server.setSocketOptions(
+            QtNetwork.QLocalServer.SocketOption.UserAccessOption
+        )
+        self._server.newConnection.connect(self._on_connection)
+
+    def listen(self) -> bool:
+        QtNetwork.QLocalServer.removeServer(str(SOCKET))
+        return self._server.listen(str(SOCKET))
+
+    def close(self):
+        self._server.close()
+        if self.carousel is not None:
+            self.carousel.resident = False
+            self.carousel.close()
+
+    def refresh(self) -> bool:
+        """Index the current directory and load it; False when it has no images.
+
+        The index follows the tree by itself afterwards, so this only does
+        real work on first use or after switching directories.
+        """
+        if self.index is None or self.index.root != self.directory:
+            if self.index is not None:
+                self.index.deleteLater()
+            self.index = WallIndex(self.directory)
+            self.index.changed.connect(self._on_index_changed)
+            self.index.refresh()
+        if not self.index.images:
+            return False
+        if self.carousel is None:
+            self.carousel = Carousel(list(self.index.images), resident=True)
+            TRACE.until_frame(self.carousel)  # the first summon
+        elif self.index.images != self.carousel.images:
+            self.carousel.set_images(list(self.index.images))
+        return True
+
+    def toggle(self, directory: str) -> str:
+        if self.carousel is not None and self.carousel.isVisible():
+            self.carousel.close()
+            return "ok"
+        self.directory = Path(directory) if directory else WALLPAPER_DIR
+        if not self.refresh():
+            return "empty"
+        self.carousel.summon()
+        return "ok"
+
+    def _on_index_changed(self, added: list[Path], removed: list[Path]):
+        if self.carousel is not None:
+            self.carousel.splice(added, removed)
+
+    def _on_connection(self):
+        while self._server.hasPendingConnections():
+            conn = self._server.nextPendingConnection()
+            conn.readyRead.connect(lambda c=conn: self._on_ready(c))
+            conn.disconnected.connect(conn.deleteLater)
+
+    def _on_ready(self, conn: QtNetwork.QLocalSocket):
+        if not conn.canReadLine():
+            return
+        cmd, _, arg = bytes(conn.readLine()).decode().rstrip("\n").partition("\t")
+        reply = self.toggle(arg) if cmd == "toggle" else "ok"
+        conn.write(reply.encode() + b"\n")
+        conn.flush()
+        conn.disconnectFromServer()
+
+
 # ── Entry ─────────────────────────────────────────────────────────────────────
 
 
 def main():
-    images = load_images(WALLPAPER_DIR)
-
-    app = QtWidgets.QApplication(sys.argv)
+    with TRACE.phase("QApplication"):
+        app = QtWidgets.QApplication(sys.argv)
     app.setApplicationName("wall")
     app.setDesktopFileName("wall")
     app.setFont(QtGui.QFont(FONT, 10))
 
+    if "--daemon" in sys.argv[1:]:
+        if daemon_request("ping") is not None:
+            sys.exit(0)  # already running
+        app.setQuitOnLastWindowClosed(False)
+        daemon = WallDaemon(WALLPAPER_DIR)
+        if not daemon.listen():
+            sys.exit(f"wall.py: cannot listen on {SOCKET}")
+        daemon.refresh()  # warm the thumbnails before the first summon
+        app.aboutToQuit.connect(daemon.close)
+        sys.exit(app.exec())
+
+    index = WallIndex(WALLPAPER_DIR)
+    index.refresh()
+    images = list(index.images)
+
     if not images:
         box = QtWidgets.QMessageBox()
         box.setWindowTitle("wall.py")
@@ -548,9 +3061,12 @@ def main():
         sys.exit(1)
 
     w = Carousel(images)
-    w.show()
-    w.raise_()
-    w.activateWindow()
+    index.changed.connect(w.splice)
+    TRACE.until_frame(w)
+    with TRACE.phase("show"):
+        w.show()
+        w.raise_()
+        w.activateWindow()
     sys.exit(app.exec())
 
 
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+wall_quick.py — Qt Quick scene-graph renderer for wall.py
+Selected with WALL_RENDERER=quick. Each thumbnail is uploaded once into the
+scene graph's shared texture atlas and every card becomes a sheared image
+quad under an opacity node, with its side shade as a tinted rectangle —
+compositing is left to the scene graph (GPU via RHI, or
+QT_QUICK_BACKEND=software). The Carousel still owns state, input and
+animation; this only draws it.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from PyQt6 import QtCore, QtGui, QtQuick, QtQuickWidgets
+
+if TYPE_CHECKING:
+    import wall
+
+# ── Config ────────────────────────────────────────────────────────────────────
+
+# Thumbnail textures kept beyond the drawn cards
+ATLAS_SPARE = 8
+LABEL_CACHE = 32  # rendered filename labels kept as textures
+
+PLACEHOLDER = QtGui.QColor(40, 40, 58)
+
+# ── Atlas ─────────────────────────────────────────────────────────────────────
+
+
+class ThumbAtlas:
+    """Thumbnail textures, least recently used dropped first.
+
+    Each is created with TextureCanUseAtlas, so on RHI backends the scene
+    graph packs it into its shared atlas: a new thumbnail uploads just its
+    own rect, and cards drawn from the same atlas page batch together.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        # image index -> (pixmap cacheKey, texture)
+        self._textures: OrderedDict[int, tuple[int, QtQuick.QSGTexture]] = OrderedDict()
+
+    def invalidate(self):
+        """Forget uploaded textures, e.g. after the scene graph was torn down."""
+        self._textures.clear()
+
+    def place(
+        self, i: int, px: QtGui.QPixmap, window: QtQuick.QQuickWindow
+    ) -> tuple[QtQuick.QSGTexture, QtCore.QRectF]:
+        """Texture and source rect of image i, uploading it if needed."""
+        entry = self._textures.get(i)
+        if entry is not None and entry[0] == px.cacheKey():
+            self._textures.move_to_end(i)
+            tex = entry[1]
+        else:
+            tex = window.createTextureFromImage(
+                px.toImage(),
+                QtQuick.QQuickWindow.CreateTextureOption.TextureCanUseAtlas,
+            )
+            self._textures[i] = (px.cacheKey(), tex)
+            self._textures.move_to_end(i)
+            while len(self._textures) > self.slots:
+                self._textures.popitem(last=False)
+        return tex, QtCore.QRectF(0, 0, px.width(), px.height())
+
+
+# ── Scene ─────────────────────────────────────────────────────────────────────
+
+
+class CardNode(QtQuick.QSGTransformNode):
+    """One card: shear transform › opacity › image (or placeholder), shade, border."""
+
+    def __init__(self, window: QtQuick.QQuickWindow):
+        super().__init__()
+        self.opacity = QtQuick.QSGOpacityNode()
+        self.image = window.createImageNode()
+        self.image.setFiltering(QtQuick.QSGTexture.Filtering.Linear)
+        self.image.setOwnsTexture(False)
+        self.blank = window.createRectangleNode()
+        self.blank.setColor(PLACEHOLDER)
+        self.shade = window.createRectangleNode()
+        self.border = [window.createRectangleNode() for _ in range(4)]
+        self.glow = QtQuick.QSGOpacityNode()
+        for edge in self.border:
+            self.glow.appendChildNode(edge)
+        self.glowing = False
+        self.appendChildNode(self.opacity)
+        self.showing: QtQuick.QSGNode | None = None
+        self.opacity.appendChildNode(self.shade)
+
+    def set_content(self, node: QtQuick.QSGNode):
+        if self.showing is not node:
+            if self.showing is not None:
+                self.opacity.removeChildNode(self.showing)
+            self.opacity.prependChildNode(node)
+            self.showing = node
+
+
+class CardScene(QtQuick.QQuickItem):
+    """Draws the carousel's current layout as scene-graph nodes."""
+
+    def __init__(self, carousel: "wall.Carousel"):
+        super().__init__()
+        self.c = carousel
+        # The carousel's own module: run as a script, wall.py is __main__,
+        # and importing it as wall would load a second copy
+        self.wall = sys.modules[type(carousel).__module__]
+        self.setFlag(QtQuick.QQuickItem.Flag.ItemHasContents, True)
+        self.atlas = ThumbAtlas(2 * self.wall.VISIBLE + 1 + ATLAS_SPARE)
+        self._labels: OrderedDict[str, QtQuick.QSGTexture] = OrderedDict()
+        self._bg: tuple[int, QtQuick.QSGTexture] | None = None
+        self._hint: tuple[str, QtQuick.QSGTexture] | None = None
+        self._frame: tuple[int, QtQuick.QSGTexture] | None = None
+        self._snapshot: tuple[int, QtQuick.QSGTexture] | None = None
+
+    def invalidate(self):
+        self.atlas.invalidate()
+        self._labels.clear()
+        self._bg = None
+        self._hint = None
+        self._frame = None
+        self._snapshot = None
+
+    # ── Textures ──────────────────────────────────────────────────────────────
+
+    def _text_image(self, text: str, font: QtGui.QFont, shadow: bool) -> QtGui.QImage:
+        dpr = self.c._dpr
+        fm = QtGui.QFontMetrics(font)
+        img = QtGui.QImage(
+            round((fm.horizontalAdvance(text) + 2) * dpr),
+            round((fm.height() + 2) * dpr),
+            QtGui.QImage.Format.Format_ARGB32_Premultiplied,
+        )
+        img.setDevicePixelRatio(dpr)
+        img.fill(QtCore.Qt.GlobalColor.transparent)
+        p = QtGui.QPainter(img)
+        p.setFont(font)
+        if shadow:
+            p.setPen(QtGui.QColor(0, 0, 0, 200))
+            p.drawText(1, fm.ascent() + 1, text)
+            p.setPen(QtGui.QColor(255, 255, 255, 230))
+        else:
+            p.setPen(QtGui.QColor(255, 255, 255))
+        p.drawText(0, fm.ascent(), text)
+        p.end()
+        return img
+
+    def _label(self, name: str) -> QtQuick.QSGTexture:
+        tex = self._labels.get(name)
+        if tex is None:
+            img = self._text_image(name, self.wall.get_font(11, bold=True), True)
+            tex = self.window().createTextureFromImage(img)
+            self._labels[name] = tex
+            while len(self._labels) > LABEL_CACHE:
+                self._labels.popitem(last=False)
+        self._labels.move_to_end(name)
+        return tex
+
+    # ── Nodes ─────────────────────────────────────────────────────────────────
+
+    def updatePaintNode(self, root, _data):
+        c = self.c
+        if c._animating:
+            c._step()
+        stats = c._stats
+        if stats is None:
+            root = self._build(root)
+        else:
+            thumbs = (c.thumbs.hits, c.thumbs.misses)
+            start = time.perf_counter()
+            root = self._build(root)
+            stats.painted(
+                start,
+                time.perf_counter(),
+                (c.thumbs.hits - thumbs[0], c.thumbs.misses - thumbs[1]),
+                (0, 0),
+            )
+        if c._animating:
+            if stats is not None:
+                stats.requested()
+            self.update()  # next frame
+        return root
+
+    def _build(self, root: QtQuick.QSGNode | None) -> QtQuick.QSGNode:
+        c, wall = self.c, self.wall
+        win = self.window()
+        if root is None:
+            self.invalidate()
+            root = QtQuick.QSGNode()
+            self._root = root
+            self._bg_node = win.createImageNode()
+            self._bg_node.setFiltering(QtQuick.QSGTexture.Filtering.Linear)
+            self._dim = win.createRectangleNode()
+            self._dim.setColor(QtGui.QColor(0, 0, 0, 155))
+            self._cards = [CardNode(win) for _ in range(2 * wall.VISIBLE + 1)]
+            self._label_op = QtQuick.QSGOpacityNode()
+            self._label_op.setOpacity(0.92)
+            self._label_node = win.createImageNode()
+            self._label_op.appendChildNode(self._label_node)
+            self._hint_op = QtQuick.QSGOpacityNode()
+            self._hint_op.setOpacity(0.30)
+            self._hint_node = win.createImageNode()
+            self._hint_op.appendChildNode(self._hint_node)
+            self._snap_node = win.createImageNode()
+        root.removeAllChildNodes()
+
+        W, H = wall.WIN_W, wall.WIN_H
+        if c._snapshot is not None:
+            key = c._snapshot.cacheKey()
+            if self._snapshot is None or self._snapshot[0] != key:
+                tex = win.createTextureFromImage(c._snapshot)
+                self._snapshot = (key, tex)
+            self._snap_node.setTexture(self._snapshot[1])
+            self._snap_node.setRect(QtCore.QRectF(0, 0, W, H))
+            root.appendChildNode(self._snap_node)
+            return root
+        self._snapshot = None
+        if c.bg_pixmap is not None and not c.bg_pixmap.isNull():
+            key = c.bg_pixmap.cacheKey()
+            if self._bg is None or self._bg[0] != key:
+                self._bg = (key, win.createTextureFromImage(c.bg_pixmap.toImage()))
+            self._bg_node.setTexture(self._bg[1])
+            self._bg_node.setRect(QtCore.QRectF(0, 0, W, H))
+            root.appendChildNode(self._bg_node)
+        self._dim.setRect(QtCore.QRectF(0, 0, W, H))
+        root.appendChildNode(self._dim)
+
+        # Upload every drawn thumbnail before handing out any texture, so
+        # one dropped to make room is never one a card already points at
+        drawn = []
+        for card, (q, di, idx, x0, y0) in zip(self._cards, c._layout()):
+            if wall.LAYOUT[q].ch <= 0:
+                continue  # shrunk to nothing at the far edge
+            src = c.thumbs.get(idx)
+            if src is None and c.thumbs.take_gone(idx):
+                c._loader.request(idx)
+            frame = c.frame(idx) if di == 0 else None
+            if frame is not None:
+                # Animation frames change every time; they skip the atlas
+                if self._frame is None or self._frame[0] != frame.cacheKey():
+                    tex = win.createTextureFromImage(frame.toImage())
+                    self._frame = (frame.cacheKey(), tex)
+                cell = (self._frame[1], QtCore.QRectF(frame.rect()))
+            else:
+                cell = None if src is None else self.atlas.place(idx, src, win)
+            drawn.append((card, q, idx, x0, y0, cell))
+
+        label = None
+        for card, q, idx, x0, y0, cell in drawn:
+            g = wall.LAYOUT[q]
+            adist = q / wall.SPRITE_STEPS
+            self._place_card(card, cell, x0, y0, g, adist)
+            root.appendChildNode(card)
+            if adist < 0.05:
+                label = (idx, y0 + g.ch)
+
+        if label is not None:
+            idx, bottom = label
+            tex = self._label(c.images[idx].stem)
+            size = tex.textureSize() / c._dpr
+            self._label_node.setTexture(tex)
+            # Baseline 28 px below the card, as in the painter renderer
+            font = wall.get_font(11, bold=True)
+            top = bottom + 28 - QtGui.QFontMetrics(font).ascent()
+            self._label_node.setRect(
+                QtCore.QRectF((W - size.width()) / 2, top, size.width(), size.height())
+            )
+            root.appendChildNode(self._label_op)
+
+        hint = c.hint()
+        if self._hint is None or self._hint[0] != hint:
+            img = self._text_image(hint, wall.get_font(10), False)
+            self._hint = (hint, win.createTextureFromImage(img))
+        self._hint_op.setOpacity(0.30 if c._query is None else 0.85)
+        size = self._hint[1].textureSize() / c._dpr
+        self._hint_node.setTexture(self._hint[1])
+        self._hint_node.setRect(
+            QtCore.QRectF((W - size.width()) / 2, H - 26, size.width(), size.height())
+        )
+        root.appendChildNode(self._hint_op)
+        return root
+
+    def _place_card(self, card: CardNode, cell, x0, y0, g, adist: float):
+        """Position card; cell is its (texture, source rect), or None if unloaded."""
+        c = self.c
+        # Unit card (cw × ch) → parallelogram leaning right by g.skew at the top
+        t = QtGui.QTransform(1, 0, -g.skew / g.ch, 1, x0 + g.skew, y0)
+        card.setMatrix(QtGui.QMatrix4x4(t))
+        card.opacity.setOpacity(g.alpha)
+        rect = QtCore.QRectF(0, 0, g.cw, g.ch)
+
+        if cell is None:
+            card.blank.setRect(rect)
+            card.set_content(card.blank)
+        else:
+            tex, cell = cell
+            # Cover-crop the thumbnail to the card's aspect
+            s = max(g.total_w / cell.width(), g.ch / cell.height())
+            sw, sh = g.cw / s, g.ch / s
+            card.image.setTexture(tex)
+            card.image.setSourceRect(
+                QtCore.QRectF(
+                    cell.x() + (cell.width() - sw) / 2,
+                    cell.y() + (cell.height() - sh) / 2,
+                    sw,
+                    sh,
+                )
+            )
+            card.image.setRect(rect)
+            card.set_content(card.image)
+
+        card.shade.setRect(rect)
+        card.shade.setColor(QtGui.QColor(0, 0, 0, int(g.darkness * g.alpha)))
+
+        # Centre-card accent border: four thin edges, sheared with the card
+        if adist < 0.12:
+            if not card.glowing:
+                card.appendChildNode(card.glow)
+                card.glowing = True
+            colour = QtGui.QColor(c.ACC)
+            card.glow.setOpacity((1.0 - adist / 0.12) * 200 / 255)
+            w, h = g.cw, g.ch
+            for edge, r in zip(
+                card.border,
+                ((0, 0, w, 2), (0, h - 2, w, 2), (0, 0, 2, h), (w - 2, 0, 2, h)),
+            ):
+                edge.setColor(colour)
+                edge.setRect(QtCore.QRectF(*r))
+        elif card.glowing:
+            card.removeChildNode(card.glow)
+            card.glowing = False
+
+
+# ── Widget ────────────────────────────────────────────────────────────────────
+
+
+class QuickLayer(QtQuickWidgets.QQuickWidget):
+    """Covers the carousel and renders it; input still goes to the carousel."""
+
+    def __init__(self, carousel: "wall.Carousel"):
+        super().__init__(carousel)
+        self.setResizeMode(QtQuickWidgets.QQuickWidget.ResizeMode.SizeRootObjectToView)
+        self.setClearColor(QtCore.Qt.GlobalColor.transparent)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_AlwaysStackOnTop)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setFocusPolicy(QtCore.Qt.FocusPolicy.NoFocus)
+        fmt = self.format()
+        fmt.setSamples(4)  # smooth the sheared card edges on GPU backends
+        self.setFormat(fmt)
+        self.setGeometry(carousel.rect())
+        self.scene = CardScene(carousel)
+        self.scene.setParentItem(self.quickWindow().contentItem())
+        self.scene.setSize(QtCore.QSizeF(carousel.size()))
+        self.quickWindow().sceneGraphInvalidated.connect(self.scene.invalidate)